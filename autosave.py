@@ -0,0 +1,154 @@
+import threading
+import time
+
+
+AUTOSAVE_INTERVAL = 60.0  # seconds of wall time between autosaves
+
+
+class AutosaveWorker:
+    """Saves the game on a background thread.
+
+    save() runs on the main thread and only captures a SaveSnapshot (array
+    copies, no file I/O); serializing, writing and fsyncing happen on the
+    worker thread. At most one save waits at a time: a new request replaces
+    a pending one and folds its changed plots into the new capture, so a
+    burst of requests costs a single write. update() requests a save every
+    `interval` seconds.
+
+    A capture that fails to write goes back to the engine with the next
+    request, and so does a journal capture taken before the failure (it
+    would leave out the plots of the failed one); the failure already made
+    the next save a full snapshot.
+    """
+
+    def __init__(self, engine, interval=AUTOSAVE_INTERVAL):
+        self.engine = engine
+        self.interval = interval
+        self._pending = None  # (request, failures seen at capture, SaveSnapshot)
+        self._failed = []  # captures that were not written, to requeue
+        self._saved_request = 0
+        self._failed_request = 0
+        self._busy = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._last_request = time.monotonic()
+
+        # Stats
+        self.requested = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_capture_ms = 0.0
+        self.last_write_ms = 0.0
+        self.max_write_ms = 0.0
+        self.total_write_ms = 0.0
+        self.last_bytes = 0
+        self.total_bytes = 0
+
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def save(self):
+        """Capture the game state now and queue it for writing; returns the
+        request number to pass to result()"""
+        start = time.perf_counter()
+        with self._condition:
+            stale, self._pending = self._pending, None
+            unwritten, self._failed = self._failed, []
+            failures = self.failed
+        if stale is not None:
+            unwritten.append(stale[2])
+            self.coalesced += 1
+        for snapshot in unwritten:
+            self.engine.requeue_save(snapshot)
+        snapshot = self.engine.capture_save()
+        self.requested += 1
+        with self._condition:
+            self._pending = (self.requested, failures, snapshot)
+            self._condition.notify_all()
+        self._last_request = time.monotonic()
+        self.last_capture_ms = (time.perf_counter() - start) * 1000
+        return self.requested
+
+    def result(self, request):
+        """True once save request `request` (or a later one) was written,
+        False if it failed, None while it is still pending"""
+        with self._condition:
+            if self._saved_request >= request:
+                return True
+            if self._failed_request >= request:
+                return False
+            return None
+
+    def update(self):
+        """Request an autosave once `interval` seconds passed since the last save"""
+        if time.monotonic() - self._last_request >= self.interval:
+            self.save()
+
+    def flush(self):
+        """Block until every requested save has been written"""
+        with self._condition:
+            while self._pending is not None or self._busy:
+                self._condition.wait()
+
+    def close(self):
+        """Write anything still pending and stop the worker (e.g. on quit)"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def stats(self):
+        """Save counts, durations (ms) and sizes (bytes)"""
+        return {
+            'requested': self.requested,
+            'coalesced': self.coalesced,
+            'completed': self.completed,
+            'failed': self.failed,
+            'last_capture_ms': self.last_capture_ms,
+            'last_write_ms': self.last_write_ms,
+            'max_write_ms': self.max_write_ms,
+            'avg_write_ms': self.total_write_ms / self.completed if self.completed else 0.0,
+            'last_bytes': self.last_bytes,
+            'total_bytes': self.total_bytes
+        }
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopping:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                (request, failures, snapshot), self._pending = self._pending, None
+                if snapshot.kind == "journal" and failures != self.failed:
+                    self._failed.append(snapshot)
+                    self._failed_request = request
+                    self._condition.notify_all()
+                    continue
+                self._busy = True
+
+            start = time.perf_counter()
+            try:
+                size = self.engine.write_save(snapshot)
+            except Exception as e:
+                size = None
+                print(f"Error saving game: {e}")
+            else:
+                elapsed = (time.perf_counter() - start) * 1000
+                self.completed += 1
+                self.last_write_ms = elapsed
+                self.max_write_ms = max(self.max_write_ms, elapsed)
+                self.total_write_ms += elapsed
+                self.last_bytes = size
+                self.total_bytes += size
+
+            with self._condition:
+                if size is None:
+                    self.failed += 1
+                    self._failed.append(snapshot)
+                    self._failed_request = request
+                else:
+                    self._saved_request = request
+                self._busy = False
+                self._condition.notify_all()
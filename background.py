@@ -0,0 +1,132 @@
+import math
+import random
+import pygame
+
+
+SKY_TOP = (135, 206, 250)
+SKY_BOTTOM = (255, 255, 255)
+GROUND = (126, 200, 80)
+CLOUD = (255, 255, 255)
+STEM = (0, 100, 0)
+FLOWER_CENTER = (255, 255, 0)
+FLOWER_SIZE = (33, 38)
+
+
+class BackgroundLayers:
+    """Layered background: static layers are baked once per resolution,
+    dynamic layers are drawn on top every frame"""
+
+    def __init__(self):
+        self.static_layers = [self.draw_sky, self.draw_ground]
+        self.dynamic_layers = []
+        self._cache = {}
+        self._clouds = {}
+
+    def add_static_layer(self, draw_func):
+        """Register a layer drawn once into the cached surface"""
+        self.static_layers.append(draw_func)
+        self.invalidate()
+
+    def add_dynamic_layer(self, draw_func):
+        """Register a layer redrawn every frame over the cached surface"""
+        self.dynamic_layers.append(draw_func)
+
+    def invalidate(self):
+        """Drop all cached static surfaces (e.g. after a layer change)"""
+        self._cache.clear()
+
+    def get_static(self, size):
+        """Return the baked static layer for the given resolution"""
+        surface = self._cache.get(size)
+        if surface is None:
+            surface = pygame.Surface(size)
+            for draw_func in self.static_layers:
+                draw_func(surface)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self._cache[size] = surface
+        return surface
+
+    def get_cloud(self, size):
+        """Return (sprite, anchor) for a cloud of the given size, baking it once.
+
+        The anchor is the cloud centre inside the sprite. Circle jitter is
+        seeded by the size so the same cloud always looks the same.
+        """
+        cloud = self._clouds.get(size)
+        if cloud is None:
+            cloud = self.bake_cloud(size)
+            self._clouds[size] = cloud
+        return cloud
+
+    def get_flower_atlas(self, colors):
+        """Bake one flower per color side by side into a single atlas surface.
+
+        Returns {color: (sprite, anchor)} where each sprite is a subsurface
+        of the atlas and the anchor is the stem base.
+        """
+        width, height = FLOWER_SIZE
+        atlas = pygame.Surface((width * len(colors), height), pygame.SRCALPHA)
+        anchor = (width // 2, height - 2)
+        for i, color in enumerate(colors):
+            self.draw_flower(atlas, i * width + anchor[0], anchor[1], color)
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        return {color: (atlas.subsurface((i * width, 0, width, height)), anchor)
+                for i, color in enumerate(colors)}
+
+    def draw(self, screen):
+        """Blit the static layer, then composite the dynamic layers"""
+        screen.blit(self.get_static(screen.get_size()), (0, 0))
+        for draw_func in self.dynamic_layers:
+            draw_func(screen)
+
+    @staticmethod
+    def draw_sky(surface):
+        """Gradient sky over the top half"""
+        width, height = surface.get_size()
+        horizon = height // 2
+        for i in range(horizon):
+            ratio = i / horizon
+            color = tuple(int(top + (bottom - top) * ratio)
+                          for top, bottom in zip(SKY_TOP, SKY_BOTTOM))
+            pygame.draw.line(surface, color, (0, i), (width, i))
+
+    @staticmethod
+    def draw_ground(surface):
+        """Grass over the bottom half"""
+        width, height = surface.get_size()
+        pygame.draw.rect(surface, GROUND, (0, height // 2, width, height - height // 2))
+
+    @staticmethod
+    def bake_cloud(size):
+        """Render a fluffy cloud of 3x2 circles into an alpha surface"""
+        rng = random.Random(size)
+        max_radius = size // 2 + 5
+        anchor_x = size // 3 + max_radius
+        anchor_y = size // 8 + max_radius
+        height = anchor_y + size // 4 - size // 8 + max_radius
+        surface = pygame.Surface((anchor_x * 2 + 1, height + 1), pygame.SRCALPHA)
+        for i in range(3):
+            for j in range(2):
+                offset_x = i * size//3 - size//3
+                offset_y = j * size//4 - size//8
+                circle_size = size//2 + rng.randint(-5, 5)
+                pygame.draw.circle(surface, CLOUD,
+                                   (anchor_x + offset_x, anchor_y + offset_y), circle_size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface, (anchor_x, anchor_y)
+
+    @staticmethod
+    def draw_flower(surface, x, y, color):
+        """Draw a flower with its stem base at (x, y)"""
+        # Stem
+        pygame.draw.line(surface, STEM, (x, y), (x, y - 20), 3)
+        # Petals
+        for angle in range(0, 360, 60):
+            px = x + 10 * math.cos(math.radians(angle))
+            py = y - 20 + 10 * math.sin(math.radians(angle))
+            pygame.draw.circle(surface, color, (int(px), int(py)), 6)
+        # Center
+        pygame.draw.circle(surface, FLOWER_CENTER, (x, y - 20), 4)
@@ -0,0 +1,389 @@
+"""Standalone performance benchmarks.
+
+Runs the game headless through SDL's dummy drivers with fixed seeds, e.g.:
+
+    python benchmark.py draw --sizes 4 16 64 256
+    python benchmark.py screens --frames 120
+    python benchmark.py update --sizes 4 64 256
+    python benchmark.py particles --counts 1000 10000 50000
+    python benchmark.py tick --tiles 16 4096 1000000
+    python benchmark.py save --sizes 4 64 256
+    python benchmark.py suite
+
+Each benchmark also reports named metrics. If the baseline file exists
+(benchmark_baseline.json next to this script, or --baseline) they are
+compared to it and anything worse by more than --tolerance is flagged as a
+regression (exit status 1). --update-baseline stores the new results.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+import main
+from State import GameState
+from crop import Crop
+from farm_engine import FarmEngine
+from particle_system import ParticleSystem
+from save_slots import slot_paths
+from farm_store import FarmStore, MOISTURE_MAX, READY_STAGE, WATERED, FERTILIZED
+
+
+SEED = 1234  # every benchmark starts from the same random state
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+TOLERANCE = 0.10  # relative slowdown flagged as a regression
+
+
+def make_game(rows, cols, watered=False):
+    """Fresh FarmGame on a rows x cols farm with every plot tilled and half planted"""
+    random.seed(SEED)
+    game = main.FarmGame(rows, cols)
+    game.rng = random.Random(SEED)
+    game.particles.rng = np.random.default_rng(SEED)
+    crop_names = list(game.crop_types)
+    for i, plot in enumerate(game.plots):
+        plot.till()
+        if i % 2 == 0:
+            plot.plant(Crop(game.crop_types[crop_names[i % len(crop_names)]]))
+        if watered:
+            plot.water()
+    return game
+
+
+def time_frames(func, frames):
+    """Average milliseconds per call of func over the given number of frames"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def bench_draw(sizes, frames):
+    """Main-screen draw cost versus farm size (camera culling keeps it flat)"""
+    results = []
+    print(f"{'farm':>10} {'plots':>8} {'drawn':>6} {'ms/frame':>9}")
+    for size in sizes:
+        game = make_game(size, size)
+        drawn = len(game.plot_grid.plots_in_rect(game.camera.view_rect()))
+        ms = time_frames(game.draw_main_game, frames)
+        print(f"{size:>4}x{size:<5} {len(game.plots):>8} {drawn:>6} {ms:>9.3f}")
+        results.append((f"draw/{size}x{size} ms/frame", ms, False))
+    return results
+
+
+def bench_screens(frames, size):
+    """Frame rate of every GameState screen: animate, draw and present, as in run()"""
+    results = []
+    game = make_game(size, size)
+    game.selected_plot = game.plots[0]
+    game.frame_time = 1 / main.FPS
+
+    def frame():
+        game.animate()
+        game.renderer.mark_full()
+        game.draw_screen()
+        game.renderer.present(game.screen)
+
+    print(f"{'screen':>13} {'ms/frame':>9} {'fps':>8}")
+    for state in GameState:
+        game.state = state
+        frame()  # first frame fills the image and text caches
+        ms = time_frames(frame, frames)
+        print(f"{state.name:>13} {ms:>9.3f} {1000 / ms:>8.1f}")
+        results.append((f"screens/{state.name} fps", 1000 / ms, True))
+    return results
+
+
+def bench_update(sizes, ticks):
+    """Game update() ticks/sec versus farm size (every plot watered and due to change)"""
+    results = []
+    print(f"{'farm':>10} {'plots':>8} {'ticks/s':>10}")
+    for size in sizes:
+        game = make_game(size, size, watered=True)
+        rate = 1000 / time_frames(game.update, ticks)
+        print(f"{size:>4}x{size:<5} {len(game.plots):>8} {rate:>10.1f}")
+        results.append((f"update/{size}x{size} ticks/s", rate, True))
+    return results
+
+
+def bench_particles(counts, frames):
+    """Update + draw throughput of a steady pool of live particles spread over the screen"""
+    results = []
+    screen = pygame.display.get_surface() or pygame.display.set_mode((main.WINDOW_WIDTH, main.WINDOW_HEIGHT))
+    print(f"{'particles':>10} {'update ms':>10} {'draw ms':>8} {'particles/s':>12}")
+    for count in counts:
+        # Twice the capacity so filling the pool never trips load shedding
+        system = ParticleSystem(count * 2, seed=SEED)
+        system.load_presets(main.PARTICLE_PRESETS)
+        styles = np.concatenate([preset['styles'] for preset in system.presets.values()])
+        rng = np.random.default_rng(SEED)
+        while system.count < count:
+            x, y = rng.integers(0, main.WINDOW_WIDTH), rng.integers(0, main.WINDOW_HEIGHT)
+            system.emit(x, y, min(100, count - system.count), (-3, 3), (-3, 3), styles, frames + 1)
+        pos, vel = system.pos[:count].copy(), system.vel[:count].copy()
+
+        update_time = draw_time = 0.0
+        for _ in range(frames):
+            # Same particles every frame, so none fall off screen
+            system.pos[:count] = pos
+            system.vel[:count] = vel
+            start = time.perf_counter()
+            system.update()
+            middle = time.perf_counter()
+            system.draw(screen)
+            update_time += middle - start
+            draw_time += time.perf_counter() - middle
+        rate = count * frames / (update_time + draw_time)
+        print(f"{count:>10} {update_time / frames * 1000:>10.3f} {draw_time / frames * 1000:>8.3f} "
+              f"{rate:>12.0f}")
+        results.append((f"particles/{count} particles/s", rate, True))
+    return results
+
+
+def make_store(tiles, seed=0, wet=0.5):
+    """FarmStore with a reproducible random mix of tilled, wet and growing tiles.
+
+    `wet` is the fraction of tiles with moisture, i.e. with upcoming events.
+    """
+    rng = np.random.default_rng(seed)
+    store = FarmStore(tiles)
+    store.crop_id("durian")
+    store.crop_id("mangosteen")
+    store.tilled[:] = rng.random(tiles) < 0.8
+    store.moisture[:] = np.where(rng.random(tiles) < wet, rng.integers(1, MOISTURE_MAX + 1, tiles), 0)
+    has_crop = store.tilled & (rng.random(tiles) < 0.7)
+    store.crop[:] = np.where(has_crop, rng.integers(1, 3, tiles), 0)
+    store.stage[:] = np.where(has_crop, rng.integers(0, READY_STAGE + 1, tiles), 0)
+    store.growth[:] = np.where(has_crop, rng.integers(0, 1200, tiles), 0)
+    flags = (store.moisture > 0) * WATERED | (rng.random(tiles) < 0.3) * FERTILIZED
+    store.flags[:] = np.where(has_crop, flags, 0)
+    store.reschedule()
+    return store
+
+
+def stores_equal(a, b):
+    """True if two stores hold exactly the same tile data"""
+    a.sync()
+    b.sync()
+    columns = ('tilled', 'moisture', 'crop', 'stage', 'growth', 'flags')
+    return all(np.array_equal(getattr(a, name), getattr(b, name)) for name in columns)
+
+
+def bench_tick(tiles_list, seconds):
+    """Updating every tile every tick versus the event-scheduled FarmStore.tick"""
+    results = []
+    print(f"{'tiles':>9} {'wet':>5} {'every-tile ticks/s':>19} {'scheduled ticks/s':>18} "
+          f"{'speedup':>8} {'identical':>9}")
+    for tiles in tiles_list:
+        for wet in (0.5, 0.01):
+            dense, sparse = make_store(tiles, wet=wet), make_store(tiles, wet=wet)
+
+            # Run the polling path for about `seconds`, then the same number of scheduled ticks
+            ticks = 0
+            start = time.perf_counter()
+            while ticks == 0 or time.perf_counter() - start < seconds:
+                dense.tick()
+                dense.sync()
+                ticks += 1
+            dense_rate = ticks / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(ticks):
+                sparse.tick()
+            sparse_rate = ticks / (time.perf_counter() - start)
+
+            print(f"{tiles:>9} {wet:>5.0%} {dense_rate:>19.1f} {sparse_rate:>18.1f} "
+                  f"{sparse_rate / dense_rate:>7.1f}x {str(stores_equal(dense, sparse)):>9}")
+            results.append((f"tick/{tiles} {wet:.0%} wet scheduled ticks/s", sparse_rate, True))
+    return results
+
+
+def make_engine(rows, cols, binary_save=False):
+    """Headless FarmEngine on a rows x cols farm: all tilled, 2/3 planted, 1/3 watered"""
+    engine = FarmEngine(rows, cols, seed=SEED, binary_save=binary_save)
+    crop_names = list(engine.crop_types)
+    for i, plot in enumerate(engine.plots):
+        plot.till()
+        if i % 3:
+            plot.plant(Crop(engine.crop_types[crop_names[i % len(crop_names)]]))
+        if i % 3 == 1:
+            plot.water()
+    return engine
+
+
+def save_matches(engine, loaded):
+    """True if loaded holds the coins and plots (tilled soil and crops) saved from engine"""
+    a, b = engine.plots.store, loaded.plots.store
+    a.sync()
+    b.sync()
+    return (loaded.coins == engine.coins and len(loaded.plots) == len(engine.plots)
+            and np.array_equal(a.tilled, b.tilled) and np.array_equal(a.crop, b.crop))
+
+
+def bench_save(sizes, repeats):
+    """Full save and load time plus file size, JSON snapshot versus binary"""
+    results = []
+    print(f"{'farm':>10} {'format':>7} {'save ms':>8} {'load ms':>8} {'bytes':>10}")
+    for size in sizes:
+        for binary in (False, True):
+            engine = make_engine(size, size, binary)
+            path = slot_paths(engine.slot)[binary]
+
+            loaded = []
+
+            def save():
+                # write_save raises on failure (save_game would only print)
+                engine.save_file.request_snapshot()
+                engine.write_save(engine.capture_save())
+
+            def load():
+                game = FarmEngine(size, size, binary_save=binary)
+                game.load_game()
+                loaded[:] = [game]
+
+            save_ms = time_frames(save, repeats)
+            load_ms = time_frames(load, repeats)
+            kind = 'binary' if binary else 'json'
+            # load_game only prints its errors: a failed load must not pass for a fast one
+            if not save_matches(engine, loaded[0]):
+                sys.exit(f"{kind} save of the {size}x{size} farm did not load back")
+            print(f"{size:>4}x{size:<5} {kind:>7} "
+                  f"{save_ms:>8.2f} {load_ms:>8.2f} {os.path.getsize(path):>10}")
+            results.append((f"save/{size}x{size} {kind} save ms", save_ms, False))
+            results.append((f"save/{size}x{size} {kind} load ms", load_ms, False))
+    return results
+
+
+def bench_suite():
+    """Every benchmark at sizes quick enough to run before each change"""
+    results = []
+    for title, bench, args in (
+            ("Screens", bench_screens, (60, 16)),
+            ("Draw", bench_draw, ([4, 16, 64], 60)),
+            ("Update", bench_update, ([4, 64, 256], 1200)),
+            ("Particles", bench_particles, ([1000, 10000, 50000], 60)),
+            ("Tick", bench_tick, ([4096, 1000000], 0.5)),
+            ("Save/load", bench_save, ([4, 64, 256], 3))):
+        print(f"\n{title}")
+        results += bench(*args)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print results next to the baseline; returns the names of regressed metrics"""
+    regressions = []
+    print(f"\n{'metric':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, value, higher_is_better in results:
+        stored = baseline.get(name)
+        if stored is None:
+            print(f"{name:<40} {'-':>12} {value:>12.3f} {'new':>8}")
+            continue
+        change = value / stored['value'] - 1 if stored['value'] else 0.0
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {stored['value']:>12.3f} {value:>12.3f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def load_baseline(path):
+    """Stored {metric: {'value', 'higher_is_better'}}, or {} if there is none yet"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(path, baseline, results):
+    """Merge results into the baseline file"""
+    for name, value, higher_is_better in results:
+        baseline[name] = {'value': value, 'higher_is_better': higher_is_better}
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--baseline", default=BASELINE_FILE, help="baseline results file")
+    common.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    common.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="relative slowdown flagged as a regression")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    draw = commands.add_parser("draw", parents=[common], help="draw cost versus farm size")
+    draw.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64, 256])
+    draw.add_argument("--frames", type=int, default=120)
+
+    screens = commands.add_parser("screens", parents=[common], help="frames/sec of every screen")
+    screens.add_argument("--frames", type=int, default=120)
+    screens.add_argument("--size", type=int, default=16, help="farm rows and columns")
+
+    update = commands.add_parser("update", parents=[common], help="game update ticks/sec versus farm size")
+    update.add_argument("--sizes", type=int, nargs="+", default=[4, 64, 256])
+    update.add_argument("--ticks", type=int, default=1200)
+
+    particles = commands.add_parser("particles", parents=[common], help="particle update + draw throughput")
+    particles.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    particles.add_argument("--frames", type=int, default=120)
+
+    tick = commands.add_parser("tick", parents=[common], help="simulation ticks/sec, every tile vs scheduled")
+    tick.add_argument("--tiles", type=int, nargs="+", default=[16, 4096, 1000000])
+    tick.add_argument("--seconds", type=float, default=1.0)
+
+    save = commands.add_parser("save", parents=[common], help="save/load time and size, JSON vs binary")
+    save.add_argument("--sizes", type=int, nargs="+", default=[4, 64, 256])
+    save.add_argument("--repeats", type=int, default=5)
+
+    commands.add_parser("suite", parents=[common], help="every benchmark at quick sizes")
+
+    args = parser.parse_args()
+    baseline_path = os.path.abspath(args.baseline)
+    with tempfile.TemporaryDirectory() as workdir:
+        # Keep real saves/settings out of the measurements
+        os.chdir(workdir)
+        if args.command == "draw":
+            results = bench_draw(args.sizes, args.frames)
+        elif args.command == "screens":
+            results = bench_screens(args.frames, args.size)
+        elif args.command == "update":
+            results = bench_update(args.sizes, args.ticks)
+        elif args.command == "particles":
+            results = bench_particles(args.counts, args.frames)
+        elif args.command == "tick":
+            results = bench_tick(args.tiles, args.seconds)
+        elif args.command == "save":
+            results = bench_save(args.sizes, args.repeats)
+        else:
+            results = bench_suite()
+
+    baseline = load_baseline(baseline_path)
+    regressions = []
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%} "
+                  f"against {baseline_path}")
+    else:
+        print(f"\nNo baseline at {baseline_path}; store one with --update-baseline")
+    if args.update_baseline:
+        save_baseline(baseline_path, baseline, results)
+        print(f"Baseline updated: {baseline_path}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
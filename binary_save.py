@@ -0,0 +1,259 @@
+"""Versioned binary save format.
+
+Layout (little-endian):
+
+    header      HEADER: magic, version, plot count, plot table offset,
+                coins, level, xp, day, tick, timestamp (POSIX seconds)
+    crop names  u8 count, then u8 length + UTF-8 name each (crop id 1..n)
+    inventory   u16 count, then per item: u8 length + category,
+                u8 length + key, i64 amount
+    plots       fixed-width PLOT_RECORD rows, 8-byte aligned, all valid at
+                the header tick
+
+The plot table is memory-mapped on read, so opening a save costs the same
+whatever the farm size and only the rows actually used are paged in.
+
+Convert between formats with:
+
+    python binary_save.py to-binary farm_save.json farm_save.bin
+    python binary_save.py to-json farm_save.bin farm_save.json
+"""
+import argparse
+import mmap
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from farm_store import FarmStore, MOISTURE_SCALE, MOISTURE_MAX, NO_CROP, WATERED, FERTILIZED
+from save_file import SaveFile, migrate_inventory, write_atomic
+
+
+MAGIC = b"FARMSAVE"
+VERSION = 1
+HEADER = struct.Struct("<8sHxxIIqIIIqd")
+PLOT_RECORD = np.dtype([
+    ('tilled', 'u1'),
+    ('crop', 'u1'),  # index into the crop name table, 0 = no crop
+    ('stage', 'u1'),
+    ('flags', 'u1'),
+    ('moisture', '<u2'),  # MOISTURE_SCALE units
+    ('growth', '<u2'),
+])
+
+
+def _pack_string(text):
+    data = text.encode("utf-8")
+    return struct.pack("<B", len(data)) + data
+
+
+def _unpack_string(buffer, offset):
+    length = buffer[offset]
+    return bytes(buffer[offset + 1:offset + 1 + length]).decode("utf-8"), offset + 1 + length
+
+
+def _close_mmap(buffer):
+    try:
+        buffer.close()
+    except BufferError:
+        pass  # a view still exports it (e.g. from a traceback); unmapped once that goes
+
+
+def plot_records(plots, crop_names):
+    """JSON save records for the rows of a PLOT_RECORD table"""
+    records = []
+    for tilled, crop, stage, flags, moisture, growth in plots.tolist():
+        record = {
+            'tilled': bool(tilled),
+            'moisture': moisture / MOISTURE_SCALE,
+            'has_crop': crop != NO_CROP
+        }
+        if crop != NO_CROP:
+            record['crop_type'] = crop_names[crop - 1]
+            record['growth_stage'] = stage
+            record['watered'] = bool(flags & WATERED)
+            record['fertilized'] = bool(flags & FERTILIZED)
+            record['growth'] = growth
+        records.append(record)
+    return records
+
+
+class BinarySave:
+    """Game state in the binary format: header fields, inventory, crop names
+    and a PLOT_RECORD table (memory-mapped when read from disk)"""
+
+    def __init__(self, header, inventory, crop_names, plots):
+        self.coins = header.get('coins', 500)
+        self.level = header.get('level', 1)
+        self.xp = header.get('xp', 0)
+        self.day = header.get('day', 1)
+        self.tick = header.get('tick', 0)
+        self.timestamp = header.get('timestamp')
+        self.inventory = inventory
+        self.crop_names = list(crop_names)
+        self.plots = plots
+        self._mmap = None
+
+    def header(self):
+        """Header fields in the same shape as the JSON save"""
+        return {
+            'coins': self.coins,
+            'level': self.level,
+            'xp': self.xp,
+            'day': self.day,
+            'tick': self.tick,
+            'timestamp': self.timestamp
+        }
+
+    @classmethod
+    def read(cls, path):
+        """Open a binary save; the plot table stays memory-mapped until close()"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            save = cls._from_buffer(buffer, path)
+        except (IndexError, struct.error) as e:
+            _close_mmap(buffer)
+            raise ValueError(f"{path} is truncated") from e
+        except Exception:
+            _close_mmap(buffer)
+            raise
+        save._mmap = buffer
+        return save
+
+    @classmethod
+    def _from_buffer(cls, buffer, path):
+        if len(buffer) < HEADER.size:
+            raise ValueError(f"{path} is too short for a binary farm save")
+        (magic, version, plot_count, plots_offset,
+         coins, level, xp, day, tick, timestamp) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary farm save")
+        if version > VERSION:
+            raise ValueError(f"{path} uses save format version {version}, newer than {VERSION}")
+
+        offset = HEADER.size
+        crop_names = []
+        name_count = buffer[offset]
+        offset += 1
+        for _ in range(name_count):
+            name, offset = _unpack_string(buffer, offset)
+            crop_names.append(name)
+
+        inventory = {}
+        (item_count,) = struct.unpack_from("<H", buffer, offset)
+        offset += 2
+        for _ in range(item_count):
+            category, offset = _unpack_string(buffer, offset)
+            key, offset = _unpack_string(buffer, offset)
+            (amount,) = struct.unpack_from("<q", buffer, offset)
+            offset += 8
+            inventory.setdefault(category, {})[key] = amount
+
+        # Checked before any view of the map exists, so a bad file can still be closed
+        if plots_offset < offset or plots_offset + plot_count * PLOT_RECORD.itemsize > len(buffer):
+            raise ValueError(f"{path} is truncated: {plot_count} plots do not fit in {len(buffer)} bytes")
+
+        header = {
+            'coins': coins, 'level': level, 'xp': xp, 'day': day, 'tick': tick,
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+        }
+        plots = np.frombuffer(buffer, dtype=PLOT_RECORD, count=plot_count, offset=plots_offset)
+        return cls(header, inventory, crop_names, plots)
+
+    def close(self):
+        """Release the memory-mapped plot table"""
+        self.plots = None
+        if self._mmap is not None:
+            _close_mmap(self._mmap)
+            self._mmap = None
+
+    def to_bytes(self):
+        timestamp = datetime.fromisoformat(self.timestamp).timestamp() if self.timestamp else 0.0
+        body = bytearray(struct.pack("<B", len(self.crop_names)))
+        for name in self.crop_names:
+            body += _pack_string(name)
+        items = [(category, key, amount) for category, counts in self.inventory.items()
+                 for key, amount in counts.items()]
+        body += struct.pack("<H", len(items))
+        for category, key, amount in items:
+            body += _pack_string(category) + _pack_string(key) + struct.pack("<q", amount)
+
+        plots_offset = -(-(HEADER.size + len(body)) // 8) * 8
+        body += bytes(plots_offset - HEADER.size - len(body))
+        header = HEADER.pack(MAGIC, VERSION, len(self.plots), plots_offset,
+                             self.coins, self.level, self.xp, self.day, self.tick, timestamp)
+        return header + bytes(body) + np.ascontiguousarray(self.plots, dtype=PLOT_RECORD).tobytes()
+
+    def write(self, path):
+        """Atomically write the save to path; returns the bytes written"""
+        data = self.to_bytes()
+        write_atomic(path, data)
+        return len(data)
+
+    @classmethod
+    def from_json(cls, data):
+        """Convert JSON save data (snapshot + journal, or an old save) to binary.
+
+        Plot records saved at different ticks are caught up to the latest
+        one, so the whole table is valid at the header tick.
+        """
+        records = data.get('plots', [])
+        crop_names = []
+        plots = np.zeros(len(records), dtype=PLOT_RECORD)
+        for i, record in enumerate(records):
+            plots['tilled'][i] = record.get('tilled', False)
+            plots['moisture'][i] = min(max(round(record.get('moisture', 0) * MOISTURE_SCALE), 0),
+                                       MOISTURE_MAX)
+            if record.get('has_crop') and record.get('crop_type'):
+                name = record['crop_type']
+                if name not in crop_names:
+                    crop_names.append(name)
+                plots['crop'][i] = crop_names.index(name) + 1
+                plots['stage'][i] = record.get('growth_stage', 0)
+                plots['growth'][i] = record.get('growth', 0)
+                plots['flags'][i] = ((WATERED if record.get('watered') else 0) |
+                                     (FERTILIZED if record.get('fertilized') else 0))
+
+        tick = data.get('tick', 0)
+        plot_ticks = data.get('plot_ticks', [tick] * len(records))
+        if any(plot_tick != tick for plot_tick in plot_ticks):
+            store = FarmStore(len(records))
+            for name in ('tilled', 'moisture', 'crop', 'stage', 'growth', 'flags'):
+                getattr(store, name)[:] = plots[name]
+            store.restore_time(tick, plot_ticks)
+            for name in ('tilled', 'moisture', 'crop', 'stage', 'growth', 'flags'):
+                plots[name] = getattr(store, name)
+
+        inventory = migrate_inventory(data.get('inventory', {}))
+        return cls(data, inventory, crop_names, plots)
+
+    def to_json(self):
+        """Save data in the JSON snapshot format"""
+        return dict(self.header(), inventory=self.inventory,
+                    plots=plot_records(self.plots, self.crop_names))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Convert farm saves between JSON and binary")
+    parser.add_argument("direction", choices=["to-binary", "to-json"])
+    parser.add_argument("source")
+    parser.add_argument("target")
+    args = parser.parse_args()
+
+    if args.direction == "to-binary":
+        data = SaveFile(args.source).load()
+        if data is None:
+            parser.error(f"{args.source} not found")
+        BinarySave.from_json(data).write(args.target)
+    else:
+        save = BinarySave.read(args.source)
+        data = save.to_json()
+        save.close()
+        # A fresh snapshot; drops any journal left next to the target
+        SaveFile(args.target).write_snapshot(data)
+    print(f"wrote {args.target}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,39 @@
+import pygame
+
+
+class Camera:
+    """Scrollable view onto the farm world.
+
+    World coordinates are what plot rects use; screen = world - (x, y).
+    The offset is clamped so the camera never scrolls past the world
+    bounds (a world smaller than the viewport never scrolls at all).
+    """
+
+    def __init__(self, viewport_size, world_rect, margin=50):
+        self.width, self.height = viewport_size
+        self.world = pygame.Rect(world_rect)
+        self.margin = margin
+        self.x = 0
+        self.y = 0
+
+    def move(self, dx, dy):
+        """Scroll by (dx, dy) pixels, clamped to the world; True if it moved"""
+        max_x = max(0, self.world.right + self.margin - self.width)
+        max_y = max(0, self.world.bottom + self.margin - self.height)
+        x = min(max(self.x + dx, 0), max_x)
+        y = min(max(self.y + dy, 0), max_y)
+        moved = (x, y) != (self.x, self.y)
+        self.x, self.y = x, y
+        return moved
+
+    def view_rect(self):
+        """World-space rect currently visible"""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def to_screen(self, rect):
+        """World rect -> screen rect"""
+        return rect.move(-self.x, -self.y)
+
+    def to_world(self, pos):
+        """Screen position -> world position"""
+        return pos[0] + self.x, pos[1] + self.y
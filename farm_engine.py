@@ -0,0 +1,476 @@
+import os
+import random
+from datetime import datetime
+import numpy as np
+from Weather import Weather
+from crop import Crop
+from CPT import CropType
+from config import TILE_SIZE
+from plot_grid import PlotGrid
+from inventory import Inventory
+from farm_store import NO_CROP
+from save_file import SaveSnapshot, migrate_inventory
+from save_slots import SaveSlots, latest_save, slot_paths
+from binary_save import BinarySave, PLOT_RECORD, plot_records
+
+
+TICK_RATE = 60  # simulation ticks per second of game time
+TICKS_PER_DAY = TICK_RATE * 60  # new day every minute
+
+WEATHERS = list(Weather)
+
+FARM_ROWS = 4
+FARM_COLS = 4
+
+# Shop price per item
+SHOP_PRICES = {
+    "durian_seeds": 30,
+    "mangosteen_seeds": 20,
+    "fertilizer": 15,
+    "water_can": 50
+}
+
+
+def default_inventory():
+    """Inventory of a new game"""
+    return {
+        "crops": {
+            "durian": 0,
+            "mangosteen": 0
+        },
+        "seeds": {
+            "durian_seeds": 10,
+            "mangosteen_seeds": 10
+        },
+        "tools": {
+            "fertilizer": 10,
+            "water_can": 10
+        }
+    }
+
+
+class FarmEngine:
+    """Game rules and state: plots, crops, inventory, coins/xp, day and weather.
+
+    Has no display, audio or input, so it can run headless at full speed;
+    FarmGame builds the UI on top of it.
+    """
+
+    def __init__(self, farm_rows=FARM_ROWS, farm_cols=FARM_COLS, seed=None, binary_save=False, slots=None):
+        self.rng = random.Random(seed)
+
+        # Game data
+        self.coins = 500
+        self.level = 1
+        self.xp = 0
+        self.day = 1
+        self.weather = Weather.SUNNY
+
+        # Enhanced inventory with categories and a flat item index
+        self.inventory = Inventory(default_inventory())
+
+        # Crop types
+        self.crop_types = {
+            "durian": CropType("Durian", 3, 100, 30, 10000),
+            "mangosteen": CropType("Mangosteen", 3, 60, 20, 7000)
+            #(ชื่อพืช, ระยะการเติบโต, ราคาซื้อ, XP ที่ได้, ราคาขาย)
+        }
+
+        # Create farm plots (4x4 grid by default) indexed for O(1) hit-testing
+        start_x = 320#ตำแหน่งบนจอของ มุมซ้ายบนของแปลงแรก
+        start_y = 200
+        spacing = TILE_SIZE + 30#ระยะห่างระหว่างแต่ละแปลง  = ขนาดแปลง (TILE_SIZE) + ช่องว่าง 30 px
+        self.plot_grid = PlotGrid(farm_rows, farm_cols, (start_x, start_y), spacing, TILE_SIZE)
+        self.plots = self.plot_grid
+        for crop_type in self.crop_types.values():
+            self.plots.store.crop_id(crop_type)
+
+        # Save slots: snapshot + journal on disk, or the binary format if enabled.
+        # Read on first use, so a headless run that never saves touches no files
+        self._slots = slots
+        self._slot = None
+        self.binary_save = binary_save
+
+        # Simulation ticks since start, and ticks caught up on the last load
+        self.animation_timer = 0
+        self.offline_ticks = 0
+
+    def get_item_from_inventory(self, key):
+        """Get item count (O(1) through the inventory's key index)"""
+        return self.inventory.get(key)
+
+    def set_item_in_inventory(self, key, value):
+        """Set item count"""
+        self.inventory.set(key, value)
+
+    def add_item_to_inventory(self, key, amount):
+        """Add (or, with a negative amount, remove) items"""
+        self.inventory.add(key, amount)
+
+    @property
+    def slots(self):
+        """SaveSlots of the game (the injected ones, else the default index)"""
+        if self._slots is None:
+            self._slots = SaveSlots()
+        return self._slots
+
+    @property
+    def slot(self):
+        """Save slot in use; the last one played until another is selected"""
+        if self._slot is None:
+            self._slot = self.slots.last_slot
+        return self._slot
+
+    @slot.setter
+    def slot(self, slot):
+        self._slot = slot
+
+    @property
+    def save_file(self):
+        """SaveFile of the current slot"""
+        return self.slots.save_file(self.slot)
+
+    def select_slot(self, slot):
+        """Switch saving and loading to another slot"""
+        self.slot = slot
+        self.slots.select(slot)
+
+    def has_save(self):
+        """True if the current slot holds a save (cached, no file access)"""
+        return self.slots.has(self.slot)
+
+    def load_game(self):
+        """Load saved game data from whichever format holds the newest save"""
+        try:
+            kind, data = latest_save(self.save_file, slot_paths(self.slot)[1], self.binary_save)
+            if kind == "binary":
+                try:
+                    self.load_plot_table(data)
+                finally:
+                    data.close()
+                return
+
+            if data is not None:
+                self.load_header(data)
+
+                # Load plots
+                plot_data = data.get('plots', [])
+                for i, plot_info in enumerate(plot_data):#loop list
+                    if i < len(self.plots):    # ตรวจสอบว่า index ไม่เกินจำนวนแปลงที่มีอยู่ใน self.plots
+                        self.plots[i].is_tilled = plot_info.get('tilled', False)#เช็คไถ
+                        self.plots[i].moisture = plot_info.get('moisture', 0)#เช็คชื้น
+
+                        if plot_info.get('has_crop'):#เก็บผัก
+                            crop_type = plot_info.get('crop_type')#เรียกชื่อผัก
+                            if crop_type in self.crop_types:
+                                crop = Crop(self.crop_types[crop_type])
+                                crop.growth_stage = plot_info.get('growth_stage', 0)  # โหลดสถานะการเติบโตของพืชจากเซฟ เช่น โตถึงขั้นไหนแล้ว (stage 0 - 3)
+                                crop.watered = plot_info.get('watered', False)
+                                crop.fertilized = plot_info.get('fertilized', False)
+                                self.plots[i].crop = crop
+                                self.plots[i].crop.growth = plot_info.get('growth', 0)
+
+                # Each plot record is valid at the tick it was saved; bring
+                # them all to the latest one, then cover the time away
+                plot_ticks = data['plot_ticks'][:len(self.plots)]
+                plot_ticks += [self.animation_timer] * (len(self.plots) - len(plot_ticks))
+                self.plots.store.restore_time(self.animation_timer, plot_ticks)
+                self.catch_up(data.get('timestamp'))
+        except Exception as e:
+            print(f"Error loading save: {e}")
+
+    def load_header(self, data):
+        """Restore coins, level, xp, day, tick and inventory from save data"""
+        self.coins = data.get('coins', 500)
+        self.level = data.get('level', 1)
+        self.xp = data.get('xp', 0)
+        self.day = data.get('day', 1)
+        self.animation_timer = data.get('tick', 0)
+
+        # Convert old inventory format to new format if needed
+        self.inventory.load(migrate_inventory(data.get('inventory', {})))
+
+    def load_plot_table(self, save):
+        """Restore the game from a BinarySave, copying its plot table column by column"""
+        self.load_header(dict(save.header(), inventory=save.inventory))
+
+        store = self.plots.store
+        count = min(len(save.plots), len(self.plots))
+        plots = save.plots[:count]
+        crop_ids = np.array([NO_CROP] + [store.crop_id(self.crop_types[name]) if name in self.crop_types
+                                         else NO_CROP for name in save.crop_names], dtype=np.uint8)
+        crop = crop_ids[plots['crop']]
+        has_crop = crop != NO_CROP
+        store.tilled[:count] = plots['tilled']
+        store.moisture[:count] = plots['moisture']
+        store.crop[:count] = crop
+        store.stage[:count] = np.where(has_crop, plots['stage'], 0)
+        store.growth[:count] = np.where(has_crop, plots['growth'], 0)
+        store.flags[:count] = np.where(has_crop, plots['flags'], 0)
+        store.restore_time(self.animation_timer, self.animation_timer)
+        self.catch_up(save.timestamp)
+
+    def plot_table(self, indices=None):
+        """Plots (default: all) as a binary PLOT_RECORD table, as of the current tick"""
+        store = self.plots.store
+        if indices is None:
+            indices = slice(None)
+        elif not len(indices):
+            return np.zeros(0, dtype=PLOT_RECORD)
+        store.sync(indices)
+        table = np.zeros(len(store.tilled[indices]), dtype=PLOT_RECORD)
+        for name in ('tilled', 'moisture', 'crop', 'stage', 'growth', 'flags'):
+            table[name] = getattr(store, name)[indices]
+        return table
+
+    def catch_up(self, timestamp, now=None):
+        """Advance the game by the wall time elapsed since `timestamp`.
+
+        Uses advance(), so a long absence costs a few closed-form steps per
+        game day instead of replaying every tick. Returns the ticks skipped.
+        """
+        self.offline_ticks = 0
+        if not timestamp:
+            return 0
+        now = now or datetime.now()
+        elapsed = (now - datetime.fromisoformat(timestamp)).total_seconds()
+        if elapsed <= 0:
+            return 0  # clock changed since the save
+        self.offline_ticks = int(elapsed * TICK_RATE)
+        self.advance(self.offline_ticks)
+        return self.offline_ticks
+
+    def capture_save(self):
+        """Copy what the next save writes into a SaveSnapshot (no file I/O).
+
+        Usually that is just the plots changed since the last save, for the
+        journal; every so often the whole farm, to compact into a new
+        snapshot instead.
+        """
+        store = self.plots.store
+        header = {
+            'coins': self.coins,
+            'level': self.level,
+            'xp': self.xp,
+            'day': self.day,
+            'inventory': self.inventory.to_dict(),
+            'tick': self.animation_timer,
+            'timestamp':datetime .now().isoformat()
+        }
+        crop_names = [crop_type.name.lower() for crop_type in store.crop_types[1:]]
+
+        if self.binary_save:
+            kind, indices = "binary", None
+            # The JSON journal no longer tracks every change since its snapshot
+            self.save_file.request_snapshot()
+        elif self.save_file.should_compact():
+            kind, indices = "snapshot", None
+        else:
+            kind, indices = "journal", np.array(sorted(store.dirty), dtype=np.int64)
+        store.dirty.clear()
+        return SaveSnapshot(self.slot, kind, header, indices, self.plot_table(indices), crop_names)
+
+    def requeue_save(self, snapshot):
+        """Fold a captured save that will never be written into the next one"""
+        if snapshot.kind == "journal":
+            self.plots.store.dirty.update(snapshot.indices.tolist())
+        else:
+            self.slots.save_file(snapshot.slot).request_snapshot()
+
+    def write_save(self, snapshot):
+        """Serialize and write a captured save; returns the bytes written.
+
+        Touches no game state besides the save file bookkeeping and the
+        slot index, so it may run on another thread.
+        """
+        save_file = self.slots.save_file(snapshot.slot)
+        try:
+            header, plots = snapshot.header, snapshot.plots
+            binary_path = slot_paths(snapshot.slot)[1]
+            if snapshot.kind == "binary":
+                size = BinarySave(header, header['inventory'], snapshot.crop_names,
+                                  plots).write(binary_path)
+                # One format per slot, so a stale one is never loaded (or parsed)
+                save_file.remove()
+            elif snapshot.kind == "snapshot":
+                plot_data = plot_records(plots, snapshot.crop_names)
+                size = save_file.write_snapshot(dict(header, plots=plot_data))
+                if os.path.exists(binary_path):
+                    os.remove(binary_path)
+            else:
+                records = plot_records(plots, snapshot.crop_names)
+                size = save_file.append(header, dict(zip(snapshot.indices.tolist(), records)))
+        except Exception:
+            # The journal may now end in a torn entry; start over from a snapshot
+            save_file.request_snapshot()
+            raise
+        self.slots.record(snapshot.slot, header)
+        return size
+
+    def save_game(self):
+        """Save game data right away"""
+        try:
+            self.write_save(self.capture_save())
+            print("Game saved successfully!")
+            return True
+        except Exception as e:
+            print(f"Error saving game: {e}")
+            return False
+
+    def till_plot(self, plot):
+        """Till untilled soil; True if anything changed"""
+        if plot.is_tilled:
+            return False
+        plot.till()
+        return True
+
+    def water_plot(self, plot):
+        """Water a plot"""
+        plot.water()
+        return True
+
+    def fertilize_plot(self, plot):
+        """Fertilize a plot's crop using one fertilizer; True on success"""
+        if plot.crop and self.get_item_from_inventory("fertilizer") > 0:
+            plot.fertilize()
+            self.add_item_to_inventory("fertilizer", -1)
+            return True
+        return False
+
+    def plant_plot(self, plot, crop_name):
+        """Plant one seed of crop_name; True on success"""
+        seed_key = crop_name + "_seeds"
+        if self.get_item_from_inventory(seed_key) > 0:
+            crop = Crop(self.crop_types[crop_name])
+            if plot.plant(crop):
+                self.add_item_to_inventory(seed_key, -1)
+                return True
+        return False
+
+    def harvest_plot(self, plot):
+        """Harvest a ready crop into the inventory; returns it, or None"""
+        if not (plot.crop and plot.crop.is_ready()):
+            return None
+        harvested = plot.harvest()
+        if harvested:
+            self.add_item_to_inventory(harvested.type.name.lower(), 1)
+            self.coins += harvested.type.sell_price
+            self.xp += 10
+            self.check_level_up()
+        return harvested
+
+    def plot_indices(self, indices=None):
+        """Index array for the bulk actions; None means every plot on the farm"""
+        if indices is None:
+            return np.arange(len(self.plots))
+        return np.asarray(indices, dtype=np.int64)
+
+    def till_plots(self, indices=None):
+        """Till every untilled plot at indices; returns the indices tilled"""
+        return self.plots.store.till_tiles(self.plot_indices(indices))
+
+    def water_plots(self, indices=None):
+        """Water every tilled plot at indices; returns the indices watered"""
+        return self.plots.store.water_tiles(self.plot_indices(indices))
+
+    def fertilize_plots(self, indices=None):
+        """Fertilize unfertilized crops at indices while fertilizer lasts; returns their indices"""
+        fertilizer = self.get_item_from_inventory("fertilizer")
+        done = self.plots.store.fertilize_tiles(self.plot_indices(indices), fertilizer)
+        self.add_item_to_inventory("fertilizer", -len(done))
+        return done
+
+    def plant_plots(self, crop_name, indices=None):
+        """Plant crop_name on empty tilled plots at indices while seeds last; returns their indices"""
+        seed_key = crop_name + "_seeds"
+        done = self.plots.store.plant_tiles(self.plot_indices(indices), self.crop_types[crop_name],
+                                            self.get_item_from_inventory(seed_key))
+        self.add_item_to_inventory(seed_key, -len(done))
+        return done
+
+    def harvest_plots(self, indices=None):
+        """Harvest every ready crop at indices with a single inventory, coin and XP
+        update; returns the indices harvested"""
+        store = self.plots.store
+        done, crops = store.harvest_tiles(self.plot_indices(indices))
+        if not len(done):
+            return done
+        counts = np.bincount(crops, minlength=len(store.crop_types))
+        harvested = [(store.crop_types[crop_id], int(counts[crop_id])) for crop_id in np.flatnonzero(counts)]
+        with self.inventory.transaction() as batch:
+            for crop_type, count in harvested:
+                batch.add(crop_type.name.lower(), count)
+        self.coins += sum(crop_type.sell_price * count for crop_type, count in harvested)
+        self.xp += 10 * len(done)
+        self.check_level_up()
+        return done
+
+    def buy_item(self, key, price):
+        """Buy one item; True if affordable"""
+        if self.coins < price:
+            return False
+        self.coins -= price
+        self.add_item_to_inventory(key, 1)
+        return True
+
+    def sell_item(self, key, quantity, price):
+        """Sell quantity items at price each; True if enough were in stock"""
+        try:
+            with self.inventory.transaction() as batch:
+                batch.remove(key, quantity)
+        except ValueError:
+            return False
+        self.coins += price * quantity
+        return True
+
+    def check_level_up(self):
+        """Apply every level up the current XP pays for; returns the levels gained"""
+        levels = 0
+        while self.xp >= 100:
+            self.level += 1
+            self.xp -= 100
+            self.coins += 50 * self.level
+            levels += 1
+            # Could add more rewards here
+        return levels
+
+    def reset_game(self):
+        """Reset game to initial state"""
+        self.coins = 500
+        self.level = 1
+        self.xp = 0
+        self.day = 1
+        self.inventory.load(default_inventory())
+        self.plots.store.reset()
+        self.save_file.request_snapshot()
+
+    def tick(self):
+        """Advance the simulation by one tick"""
+        self.animation_timer += 1
+
+        # Update plots (only tiles with a growth or drying event due)
+        self.plots.store.tick()
+
+        # Day cycle (optional)
+        if self.animation_timer % TICKS_PER_DAY == 0:  # New day every minute
+            self.new_day()
+
+    def advance(self, ticks):
+        """Advance the simulation by many ticks at once.
+
+        Same result as calling tick() `ticks` times: plot growth does not
+        depend on the day, so plots jump forward in one closed-form step
+        and the day boundaries crossed are replayed afterwards.
+        """
+        if ticks <= 0:
+            return
+        days = (self.animation_timer % TICKS_PER_DAY + ticks) // TICKS_PER_DAY
+        self.plots.store.advance(ticks)
+        self.animation_timer += ticks
+        for _ in range(days):
+            self.new_day()
+
+    def new_day(self):
+        """Start the next day with new weather"""
+        self.day += 1
+        self.weather = self.rng.choice(WEATHERS)
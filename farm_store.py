@@ -0,0 +1,478 @@
+import heapq
+import numpy as np
+from crop import Crop
+
+
+# Plot rules (one tick = 1/60 s of game time)
+MOISTURE_SCALE = 10  # stored moisture units per moisture point (0-100)
+MOISTURE_MAX = 100 * MOISTURE_SCALE  # evaporates one unit (0.1 point) per tick
+GROWTH_PER_STAGE = 1200  # growth points needed per stage (10 s unfertilized)
+GROWTH_RATE = 2  # growth points per watered tick
+FERTILIZED_GROWTH_RATE = 3  # fertilizer makes crops grow 50% faster
+READY_STAGE = 2  # seedling, growing, mature
+
+# Bit flags
+WATERED = 1
+FERTILIZED = 2
+
+NO_CROP = 0
+
+# Scheduling
+NOT_DUE = -1  # tile has no upcoming event
+NEVER = np.iinfo(np.int64).max // 2
+NO_TILES = np.zeros(0, dtype=np.int64)
+BULK_ADVANCE_TICKS = 3600  # advance() jumps this long resync the whole farm
+
+
+class FarmStore:
+    """Struct-of-arrays storage for every farm tile.
+
+    Each tile is a handful of bytes spread over NumPy columns instead of a
+    FarmPlot + Crop object pair. PlotView/CropView give the familiar object
+    interface on top of a single index.
+
+    Time is tracked lazily: each tile remembers the tick its columns were
+    last brought up to date (`synced`) and is caught up in closed form when
+    it is read. A priority queue holds the next tick at which each tile
+    changes on its own (a growth stage completes or the soil dries out), so
+    tick() only touches the tiles that are due and an idle farm costs
+    nothing however large it is.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tilled = np.zeros(size, dtype=np.bool_)
+        self.moisture = np.zeros(size, dtype=np.uint16)  # MOISTURE_SCALE units
+        self.crop = np.zeros(size, dtype=np.uint8)  # crop type id, 0 = no crop
+        self.stage = np.zeros(size, dtype=np.uint8)
+        self.growth = np.zeros(size, dtype=np.uint16)  # points into the current stage
+        self.flags = np.zeros(size, dtype=np.uint8)
+
+        # Scheduling
+        self.now = 0
+        self.synced = np.zeros(size, dtype=np.int64)  # tick the tile is up to date at
+        self.due = np.full(size, NOT_DUE, dtype=np.int64)  # next event tick
+        self._events = []  # heap of (tick, index)
+
+        # Tiles changed by the player since the last save
+        self.dirty = set()
+
+        # Crop type id -> CropType (id 0 is "no crop")
+        self.crop_types = [None]
+        self._crop_ids = {}
+
+    def __len__(self):
+        return self.size
+
+    def bytes_per_tile(self):
+        """Memory used per tile by the columns"""
+        columns = (self.tilled, self.moisture, self.crop, self.stage, self.growth, self.flags,
+                   self.synced, self.due)
+        return sum(column.itemsize for column in columns)
+
+    def crop_id(self, crop_type):
+        """Id for a CropType, registering it on first use"""
+        crop_id = self._crop_ids.get(crop_type)
+        if crop_id is None:
+            crop_id = len(self.crop_types)
+            self.crop_types.append(crop_type)
+            self._crop_ids[crop_type] = crop_id
+        return crop_id
+
+    def reset(self):
+        """Clear every tile (untilled, dry, no crop)"""
+        for column in (self.tilled, self.moisture, self.crop, self.stage, self.growth, self.flags):
+            column.fill(0)
+        self.synced.fill(self.now)
+        self.due.fill(NOT_DUE)
+        self._events.clear()
+        self.dirty.clear()
+
+    def tick(self):
+        """Advance time by one tick; returns the indices of tiles that changed"""
+        return self.advance(1)
+
+    def advance(self, ticks):
+        """Advance time by `ticks` ticks.
+
+        Only tiles with an event due by then are caught up and rescheduled;
+        their indices are returned. Every other tile catches up when read.
+        """
+        self.now += ticks
+        if ticks >= BULK_ADVANCE_TICKS:
+            # Long jump (e.g. offline catch-up): most queued events are due,
+            # so catch up the whole farm at once and rebuild the queue
+            due = np.flatnonzero((self.due != NOT_DUE) & (self.due <= self.now))
+            self.sync()
+            self.reschedule()
+            return due
+        events = self._events
+        due = []
+        while events and events[0][0] <= self.now:
+            tick, index = heapq.heappop(events)
+            if self.due[index] == tick:
+                self.due[index] = NOT_DUE
+                due.append(index)
+        if not due:
+            return NO_TILES
+        due = np.array(due, dtype=np.int64)
+        self.sync(due)
+        self.reschedule(due)
+        return due
+
+    def pending_events(self):
+        """Number of queued events (including superseded ones)"""
+        return len(self._events)
+
+    def sync(self, indices=None):
+        """Bring tiles (default: all) up to the current tick"""
+        if indices is None:
+            indices = slice(None)
+        elapsed = self.now - self.synced[indices]
+        if not np.any(elapsed):
+            return
+        self._catch_up(indices, elapsed)
+        self.synced[indices] = self.now
+
+    def sync_one(self, index):
+        """Bring one tile up to the current tick"""
+        if self.synced[index] != self.now:
+            self.sync([index])
+
+    def reschedule(self, indices=None):
+        """Recompute the next event of tiles (default: all) after a change"""
+        rebuild = indices is None
+        if rebuild:
+            indices = np.arange(self.size)
+        indices = np.asarray(indices, dtype=np.int64)
+        moisture = self.moisture[indices].astype(np.int64)
+        flags = self.flags[indices]
+        growth = self.growth[indices].astype(np.int64)
+        growing = ((self.crop[indices] != NO_CROP) & (flags & WATERED != 0) &
+                   (self.stage[indices] < READY_STAGE))
+
+        # Next stage, unless the soil dries out first (no growth on the drying tick)
+        rate = np.where(flags & FERTILIZED != 0, FERTILIZED_GROWTH_RATE, GROWTH_RATE)
+        to_stage = -((growth - GROWTH_PER_STAGE) // rate)
+        stage_due = growing & ((moisture == 0) | (to_stage <= moisture - 1))
+        delay = np.where(stage_due, to_stage, NEVER)
+        delay = np.minimum(delay, np.where(moisture > 0, moisture, NEVER))
+
+        due = np.where(delay < NEVER, self.now + delay, NOT_DUE)
+        self.due[indices] = due
+        if rebuild:
+            pending = due != NOT_DUE
+            self._events = list(zip(due[pending].tolist(), indices[pending].tolist()))
+            heapq.heapify(self._events)
+            return
+        for index, tick in zip(indices.tolist(), due.tolist()):
+            if tick != NOT_DUE:
+                heapq.heappush(self._events, (tick, index))
+
+    def changed(self, index):
+        """Record a player change to one tile: reschedule it and mark it for saving"""
+        self.dirty.add(index)
+        self.reschedule_one(index)
+
+    def changed_many(self, indices):
+        """changed() for an array of tiles in one vectorized step"""
+        self.dirty.update(indices.tolist())
+        self.reschedule(indices)
+
+    # Bulk player actions: each narrows an index array down to the tiles the
+    # action applies to (at most `limit` of them), changes them all at once
+    # and returns their indices
+
+    def till_tiles(self, indices):
+        """Till the untilled tiles"""
+        indices = indices[~self.tilled[indices]]
+        self.tilled[indices] = True
+        self.dirty.update(indices.tolist())
+        return indices
+
+    def water_tiles(self, indices):
+        """Soak the tilled tiles and mark their crops as watered"""
+        indices = indices[self.tilled[indices]]
+        self.sync(indices)
+        self.moisture[indices] = MOISTURE_MAX
+        self.flags[indices] |= np.where(self.crop[indices] != NO_CROP, WATERED, 0).astype(np.uint8)
+        self.changed_many(indices)
+        return indices
+
+    def fertilize_tiles(self, indices, limit=None):
+        """Fertilize the crops that are not fertilized yet"""
+        indices = indices[(self.crop[indices] != NO_CROP) & (self.flags[indices] & FERTILIZED == 0)][:limit]
+        self.sync(indices)
+        self.flags[indices] |= FERTILIZED
+        self.changed_many(indices)
+        return indices
+
+    def plant_tiles(self, indices, crop_type, limit=None):
+        """Plant fresh crops of crop_type on the tilled, empty tiles"""
+        indices = indices[self.tilled[indices] & (self.crop[indices] == NO_CROP)][:limit]
+        self.sync(indices)
+        self.clear_crop(indices)
+        self.crop[indices] = self.crop_id(crop_type)
+        self.flags[indices] = np.where(self.moisture[indices] > 0, WATERED, 0)
+        self.changed_many(indices)
+        return indices
+
+    def harvest_tiles(self, indices):
+        """Clear the ready crops; returns (indices, crop type ids harvested)"""
+        self.sync(indices)
+        indices = indices[(self.crop[indices] != NO_CROP) & (self.stage[indices] >= READY_STAGE)]
+        crops = self.crop[indices]
+        self.clear_crop(indices)
+        self.changed_many(indices)
+        return indices, crops
+
+    def restore_time(self, now, synced):
+        """Set the clock after loading tiles that were saved at different ticks"""
+        self.now = now
+        self.synced[:] = synced
+        self.sync()
+        self.reschedule()
+        self.dirty.clear()
+
+    def reschedule_one(self, index):
+        """Recompute the next event of one tile after a change"""
+        moisture = int(self.moisture[index])
+        flags = int(self.flags[index])
+        due = self.now + moisture if moisture else NOT_DUE
+        if self.crop[index] != NO_CROP and flags & WATERED and self.stage[index] < READY_STAGE:
+            rate = FERTILIZED_GROWTH_RATE if flags & FERTILIZED else GROWTH_RATE
+            to_stage = -((int(self.growth[index]) - GROWTH_PER_STAGE) // rate)
+            if moisture == 0 or to_stage <= moisture - 1:
+                due = self.now + to_stage
+        self.due[index] = due
+        if due != NOT_DUE:
+            heapq.heappush(self._events, (due, index))
+
+    def _catch_up(self, indices, ticks):
+        """Advance the tiles at `indices` by `ticks` (per tile) in closed form.
+
+        Same result as stepping one tick at a time: soil loses one unit per
+        tick and stops counting as watered when it dries, and a watered,
+        unripe crop earns growth points on every tick that ends with wet soil.
+        """
+        moisture = self.moisture[indices].astype(np.int64)
+        flags = self.flags[indices]
+        stage = self.stage[indices].astype(np.int64)
+        growth = self.growth[indices].astype(np.int64)
+        growing = (self.crop[indices] != NO_CROP) & (flags & WATERED != 0) & (stage < READY_STAGE)
+
+        # A crop grows on every tick that ends with wet soil; soil already
+        # at 0 with the watered flag set never dries, so it grows every tick
+        wet = moisture > 0
+        growth_ticks = np.where(wet, np.minimum(ticks, moisture - 1), ticks)
+        growth_ticks = np.where(growing, growth_ticks, 0)
+
+        # Evaporation
+        moisture = np.where(wet, np.maximum(moisture - ticks, 0), moisture)
+        dried = wet & (moisture == 0)
+        flags = np.where(dried, flags & (~WATERED & 0xFF), flags)
+
+        # Growth: finish the current stage, then whole stages, then a remainder
+        rate = np.where(flags & FERTILIZED != 0, FERTILIZED_GROWTH_RATE, GROWTH_RATE)
+        first_stage = -((growth - GROWTH_PER_STAGE) // rate)  # ceil((1200 - growth) / rate)
+        per_stage = -(-GROWTH_PER_STAGE // rate)
+
+        finished = growing & (growth_ticks >= first_stage)
+        left = np.where(finished, growth_ticks - first_stage, 0)
+        gained = np.where(finished, 1 + left // per_stage, 0)
+        gained = np.minimum(gained, READY_STAGE - stage)
+        new_stage = stage + gained
+        new_growth = np.where(finished, (left - (gained - 1) * per_stage) * rate,
+                              growth + growth_ticks * rate)
+        new_growth = np.where(growing & (new_stage >= READY_STAGE), 0, new_growth)
+
+        self.moisture[indices] = moisture
+        self.flags[indices] = flags
+        self.stage[indices] = np.where(growing, new_stage, stage)
+        self.growth[indices] = np.where(growing, new_growth, growth)
+
+    def clear_crop(self, index):
+        """Remove the crop from one tile (or an index array of them)"""
+        self.crop[index] = NO_CROP
+        self.stage[index] = 0
+        self.growth[index] = 0
+        self.flags[index] = 0
+
+
+class PlotView:
+    """FarmPlot interface over one tile of a FarmStore.
+
+    Reads catch the tile up to the store's current tick first; mutations
+    reschedule its next event and mark it for the next save.
+    """
+
+    __slots__ = ('store', 'index', 'rect')
+
+    def __init__(self, store, index, rect):
+        self.store = store
+        self.index = index
+        self.rect = rect
+
+    def __eq__(self, other):
+        return isinstance(other, PlotView) and other.store is self.store and other.index == self.index
+
+    def __hash__(self):
+        return hash(self.index)
+
+    @property
+    def is_tilled(self):
+        return bool(self.store.tilled[self.index])
+
+    @is_tilled.setter
+    def is_tilled(self, value):
+        self.store.tilled[self.index] = value
+        self.store.dirty.add(self.index)
+
+    @property
+    def moisture(self):
+        self.store.sync_one(self.index)
+        return self.store.moisture[self.index] / MOISTURE_SCALE
+
+    @moisture.setter
+    def moisture(self, value):
+        store, i = self.store, self.index
+        store.sync_one(i)
+        store.moisture[i] = min(max(round(value * MOISTURE_SCALE), 0), MOISTURE_MAX)
+        store.changed(i)
+
+    @property
+    def crop(self):
+        if self.store.crop[self.index] == NO_CROP:
+            return None
+        return CropView(self.store, self.index)
+
+    @crop.setter
+    def crop(self, crop):
+        store, i = self.store, self.index
+        store.sync_one(i)
+        self._set_crop(crop)
+        store.changed(i)
+
+    def till(self):
+        """Prepare the soil for planting"""
+        self.store.tilled[self.index] = True
+        self.store.dirty.add(self.index)
+
+    def water(self):
+        """Soak tilled soil and mark the crop as watered"""
+        store, i = self.store, self.index
+        if store.tilled[i]:
+            store.sync_one(i)
+            store.moisture[i] = MOISTURE_MAX
+            if store.crop[i] != NO_CROP:
+                store.flags[i] |= WATERED
+            store.changed(i)
+
+    def fertilize(self):
+        """Fertilize the crop (if any)"""
+        store, i = self.store, self.index
+        if store.crop[i] != NO_CROP:
+            store.sync_one(i)
+            store.flags[i] |= FERTILIZED
+            store.changed(i)
+
+    def plant(self, crop):
+        """Plant a crop on tilled, empty soil; True on success"""
+        store, i = self.store, self.index
+        if not store.tilled[i] or store.crop[i] != NO_CROP:
+            return False
+        store.sync_one(i)
+        self._set_crop(crop)
+        if store.moisture[i] > 0:
+            store.flags[i] |= WATERED
+        store.changed(i)
+        return True
+
+    def harvest(self):
+        """Remove and return the crop if it is ready, else None"""
+        store, i = self.store, self.index
+        store.sync_one(i)
+        if store.crop[i] == NO_CROP or store.stage[i] < READY_STAGE:
+            return None
+        harvested = Crop(store.crop_types[store.crop[i]])
+        harvested.growth_stage = int(store.stage[i])
+        store.clear_crop(i)
+        store.changed(i)
+        return harvested
+
+    def _set_crop(self, crop):
+        store, i = self.store, self.index
+        store.clear_crop(i)
+        if crop is not None:
+            store.crop[i] = store.crop_id(crop.type)
+            store.stage[i] = crop.growth_stage
+            store.flags[i] = (WATERED if crop.watered else 0) | (FERTILIZED if crop.fertilized else 0)
+
+
+class CropView:
+    """Crop interface over the crop columns of one FarmStore tile"""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def type(self):
+        return self.store.crop_types[self.store.crop[self.index]]
+
+    @property
+    def growth_stage(self):
+        self.store.sync_one(self.index)
+        return int(self.store.stage[self.index])
+
+    @growth_stage.setter
+    def growth_stage(self, value):
+        store, i = self.store, self.index
+        store.sync_one(i)
+        store.stage[i] = value
+        store.changed(i)
+
+    @property
+    def growth(self):
+        """Growth points earned towards the next stage"""
+        self.store.sync_one(self.index)
+        return int(self.store.growth[self.index])
+
+    @growth.setter
+    def growth(self, value):
+        store, i = self.store, self.index
+        store.sync_one(i)
+        store.growth[i] = min(max(int(value), 0), GROWTH_PER_STAGE - 1)
+        store.changed(i)
+
+    @property
+    def watered(self):
+        self.store.sync_one(self.index)
+        return bool(self.store.flags[self.index] & WATERED)
+
+    @watered.setter
+    def watered(self, value):
+        self._set_flag(WATERED, value)
+
+    @property
+    def fertilized(self):
+        return bool(self.store.flags[self.index] & FERTILIZED)
+
+    @fertilized.setter
+    def fertilized(self, value):
+        self._set_flag(FERTILIZED, value)
+
+    def is_ready(self):
+        self.store.sync_one(self.index)
+        return self.store.stage[self.index] >= READY_STAGE
+
+    def _set_flag(self, flag, value):
+        store, i = self.store, self.index
+        store.sync_one(i)
+        if value:
+            store.flags[i] |= flag
+        else:
+            store.flags[i] &= ~flag & 0xFF
+        store.changed(i)
@@ -0,0 +1,58 @@
+import pygame
+
+
+class ImageCache:
+    """(name, size) variant cache in front of an ImageLoader.
+
+    Each variant is loaded/scaled and converted to the display format once;
+    every later get() for the same name and size returns the same surface.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self._variants = {}
+        self.prewarmed = False
+
+        # Stats
+        self.hits = 0
+        self.scale_ops = 0
+        self.late_scale_ops = 0  # variants first requested after prewarm()
+
+    def get(self, name, size=None):
+        """Same signature as ImageLoader.get, served from the variant cache"""
+        key = (name, tuple(size) if size else None)
+        image = self._variants.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        image = self._load(name, size)
+        self._variants[key] = image
+        self.scale_ops += 1
+        if self.prewarmed:
+            self.late_scale_ops += 1
+        return image
+
+    def prewarm(self, variants):
+        """Build every (name, size) variant up front, outside the frame loop"""
+        for name, size in variants:
+            self.get(name, size)
+        self.prewarmed = True
+
+    def stats(self):
+        """Cache counters for profiling"""
+        return {
+            'variants': len(self._variants),
+            'hits': self.hits,
+            'scale_ops': self.scale_ops,
+            'late_scale_ops': self.late_scale_ops
+        }
+
+    def _load(self, name, size):
+        """Ask the loader for the variant and convert it for fast blits"""
+        image = self.loader.get(name, size)
+        if pygame.display.get_surface() is None:
+            return image
+        if image.get_flags() & pygame.SRCALPHA or image.get_colorkey() is not None:
+            return image.convert_alpha()
+        return image.convert()
@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+
+
+class Inventory:
+    """Item counts grouped by category, with a flat key -> slot index.
+
+    Categories keep the {category: {key: count}} layout the UI and the save
+    files use. Every key also maps straight to the category dict holding it
+    (its slot), so get/set/add are O(1) however many items the catalog has.
+    Unknown keys read as 0 and are ignored on write.
+
+    Listeners registered with subscribe() are called with the set of keys
+    that changed: after every single change, or once per transaction.
+    """
+
+    def __init__(self, categories=None):
+        self.categories = {}
+        self._slots = {}
+        self._listeners = []
+        self.version = 0  # bumped on every change, for cheap cache checks
+        if categories:
+            self.load(categories)
+
+    def load(self, categories):
+        """Replace the whole inventory with {category: {key: count}}"""
+        self.categories = {name: dict(items) for name, items in categories.items()}
+        self._slots = {key: items for items in self.categories.values() for key in items}
+        self._changed(set(self._slots))
+
+    def to_dict(self):
+        """Copy in the {category: {key: count}} layout (e.g. for saving)"""
+        return {name: dict(items) for name, items in self.categories.items()}
+
+    def category(self, name):
+        """{key: count} of one category (read-only use)"""
+        return self.categories.get(name, {})
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def get(self, key):
+        slot = self._slots.get(key)
+        return slot[key] if slot is not None else 0
+
+    def set(self, key, value):
+        slot = self._slots.get(key)
+        if slot is not None and slot[key] != value:
+            slot[key] = value
+            self._changed({key})
+
+    def add(self, key, amount):
+        slot = self._slots.get(key)
+        if slot is not None and amount:
+            slot[key] += amount
+            self._changed({key})
+
+    @contextmanager
+    def transaction(self):
+        """Apply a batch of adds/removes all at once, or not at all.
+
+        Yields an InventoryTransaction to record changes on. On exit every
+        change is checked first: if a key is unknown or a count would drop
+        below zero, ValueError is raised and the inventory is untouched.
+        Listeners are notified once for the whole batch.
+        """
+        batch = InventoryTransaction(self)
+        yield batch
+        self.commit(batch.deltas)
+
+    def commit(self, deltas):
+        """Apply {key: delta} atomically (see transaction())"""
+        for key, delta in deltas.items():
+            if key not in self._slots:
+                raise ValueError(f"unknown item {key!r}")
+            if self.get(key) + delta < 0:
+                raise ValueError(f"not enough {key!r}: have {self.get(key)}, need {-delta}")
+        changed = {key for key, delta in deltas.items() if delta}
+        for key in changed:
+            self._slots[key][key] += deltas[key]
+        if changed:
+            self._changed(changed)
+
+    def subscribe(self, listener):
+        """Call listener(changed_keys) after every change"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _changed(self, keys):
+        self.version += 1
+        for listener in self._listeners:
+            listener(keys)
+
+
+class InventoryTransaction:
+    """Changes recorded inside an Inventory.transaction() block"""
+
+    def __init__(self, inventory):
+        self.inventory = inventory
+        self.deltas = {}
+
+    def get(self, key):
+        """Count of key including the changes recorded so far"""
+        return self.inventory.get(key) + self.deltas.get(key, 0)
+
+    def add(self, key, amount=1):
+        self.deltas[key] = self.deltas.get(key, 0) + amount
+
+    def remove(self, key, amount=1):
+        self.add(key, -amount)
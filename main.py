@@ -1,21 +1,27 @@
 import os
 import json
+import itertools
 import random
 import sys
 import pygame
 import math
 import time
 from State import GameState
-from Weather import Weather
-from particle import Particle
-from crop import Crop
-from CPT import CropType
+from particle_system import ParticleSystem
 from music import SoundManager
-from datetime import datetime
 from enum import Enum
-from Plot import FarmPlot
 from config import TILE_SIZE
 from image_loader import ImageLoader
+from image_cache import ImageCache
+from farm_engine import FarmEngine, SHOP_PRICES, TICK_RATE, FARM_ROWS, FARM_COLS
+from farm_store import NO_CROP
+from background import BackgroundLayers
+from camera import Camera
+from sim_clock import FixedTimestep
+from renderer import DirtyRectRenderer
+from text_cache import TextCache
+from autosave import AutosaveWorker
+from profiler import FrameProfiler
 
 
 pygame.init()
@@ -26,8 +32,27 @@ pygame.mixer.init()
 WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 800
 FPS = 60
+IDLE_FPS = 30  # render rate for static screens while something still animates
+IDLE_TIMEOUT = 1000  # ms an idle screen sleeps at most waiting for input
+DIRTY_RECTS = False  # opt-in: push only changed regions instead of flipping
+FLOWER_SEED = 15  # same flower row every run
+MAX_PARTICLES = 10000  # particle pool capacity
+WELCOME_Y = 420  # start screen welcome text, waving WELCOME_WAVE pixels up and down
+WELCOME_WAVE = 10
+CAMERA_SPEED = 15  # pixels per frame while an arrow key is held
+WHEEL_BUTTONS = (4, 5)  # pygame 2 also reports wheel notches as button presses
+DRAG_THRESHOLD = 10  # pixels the mouse must move before a click becomes a drag
+BULK_EFFECT_SCALE = 4  # max particle burst multiplier for a bulk action
+PROFILE_KEY = pygame.K_F3  # toggles the profiler and its overlay
+PROFILE_EXPORT_KEY = pygame.K_F4  # writes the collected frames to PROFILE_TRACE_FILES
+PROFILE_TRACE_FILES = ("frame_profile.csv", "frame_profile.json")
+# Draw methods timed as profiler sections: each screen and the layers of the farm
+# (not draw_screen, which is the 'draw' section itself, nor small helpers, nor
+# draw_flowers, which only runs when the static background is baked)
+PROFILED_DRAWS = ('draw_start_screen', 'draw_main_game', 'draw_shop', 'draw_inventory',
+                  'draw_planting_menu', 'draw_settings', 'draw_background', 'draw_clouds',
+                  'draw_ui_panel', 'draw_farm_plot', 'draw_crop')
 
-SAVE_FILE = "farm_save.json"
 
 
 GRASS_GREEN = (126, 200, 80)
@@ -54,20 +79,54 @@ LIGHT_GRAY = (200, 200, 200)
 DARK_GRAY = (100, 100, 100)
 
 
+# Particle emitter presets: burst size, velocity ranges, palette, lifetime, radius
+PARTICLE_PRESETS = {
+    "water": {'count': 15, 'vx': (-3, 3), 'vy': (-5, -2), 'colors': [SKY_BLUE], 'life': 40, 'size': 4},
+    "harvest": {'count': 20, 'vx': (-4, 4), 'vy': (-6, -2), 'colors': [GOLDEN, YELLOW, ORANGE], 'life': 50, 'size': 5},
+    "plant": {'count': 10, 'vx': (-2, 2), 'vy': (-3, -1), 'colors': [LIGHT_GREEN], 'life': 30, 'size': 3},
+    "fertilize": {'count': 12, 'vx': (-3, 3), 'vy': (-4, -2), 'colors': [BROWN], 'life': 35, 'size': 4},
+    "coin": {'count': 8, 'vx': (-2, 2), 'vy': (-5, -3), 'colors': [GOLDEN], 'life': 40, 'size': 6}
+}
+
+
+# Every (image, size) variant the draw code asks for, built once at startup
+IMAGE_VARIANTS = [
+    ('cat', (200, 200)),
+    ('coin', (32, 32)),
+    ('coin', (40, 40)),
+    ('plot', (TILE_SIZE, TILE_SIZE)),
+    ('seedling', (40, 40)),
+    ('durian', (60, 60)),
+    ('durian', (80, 80)),
+    ('mangosteen', (50, 50)),
+    ('mangosteen', (70, 70)),
+    ('water_can', (40, 40)),
+    ('fertilizer', (40, 40)),
+    ('market', (100, 100)),
+] + [(icon, size) for icon in ('durian', 'mangosteen', 'durian_seed', 'mangosteen_seed',
+                                'fertilizer', 'water_can')
+     for size in ((60, 60), (80, 80))]
+
+
 
 ###################################################################################################
 
 
-class FarmGame:
-    def __init__(self):
+class FarmGame(FarmEngine):
+    def __init__(self, farm_rows=FARM_ROWS, farm_cols=FARM_COLS):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("🌻 Happy Farm - Vegetables Day 🌻")
         self.clock = pygame.time.Clock()
+        self.sim_clock = FixedTimestep(TICK_RATE)
+        self.frame_time = 0.0
+        self.renderer = DirtyRectRenderer((WINDOW_WIDTH, WINDOW_HEIGHT), DIRTY_RECTS)
+        self.profiler = FrameProfiler()  # off until PROFILE_KEY is pressed
         self.running = True
         self.state = GameState.START_SCREEN
 
         # Load assets
-        self.images = ImageLoader()
+        self.images = ImageCache(ImageLoader())
+        self.images.prewarm(IMAGE_VARIANTS)
         self.sounds = SoundManager()
 
         # Fonts
@@ -76,32 +135,15 @@ class FarmGame:
         self.font_medium = pygame.font.Font(None, 48)
         self.font_small = pygame.font.Font(None, 32)
         self.font_tiny = pygame.font.Font(None, 24)
+        self.text_cache = TextCache()
 
-        # Game data
-        self.coins = 500
-        self.level = 1
-        self.xp = 0
-        self.day = 1
-        self.weather = Weather.SUNNY
-
-        # Enhanced inventory with categories
-        self.inventory = {
-            "crops": {
-                "durian": 0,
-                "mangosteen": 0
-            },
-            "seeds": {
-                "durian_seeds": 10,
-                "mangosteen_seeds": 10
-            },
-            "tools": {
-                "fertilizer": 10,
-                "water_can": 10
-            }
-        }
+        # Game data, crop types and farm plots
+        FarmEngine.__init__(self, farm_rows, farm_cols)
 
         # Inventory UI state
         self.inventory_tab = "crops"  # crops, seeds, tools
+        self._stocked_items = {}
+        self.inventory.subscribe(lambda keys: self._stocked_items.clear())
         self.selected_item = None
         self.item_hover = None
         
@@ -109,44 +151,52 @@ class FarmGame:
         self.sell_mode = False
         self.sell_quantity = 1
 
-        # Crop types
-        self.crop_types = {
-            "durian": CropType("Durian", 3, 100, 30, 10000),
-            "mangosteen": CropType("Mangosteen", 3, 60, 20, 7000)
-            #(ชื่อพืช, ระยะการเติบโต, ราคาซื้อ, XP ที่ได้, ราคาขาย)
-        }
-
-        # Create farm plots (4x4 grid)
-        self.plots = []
-        start_x = 320#ตำแหน่งบนจอของ มุมซ้ายบนของแปลงแรก
-        start_y = 200
-        spacing = TILE_SIZE + 30#ระยะห่างระหว่างแต่ละแปลง  = ขนาดแปลง (TILE_SIZE) + ช่องว่าง 30 px
-        for i in range(4):#loopแปลง
-            for j in range(4):
-                x = start_x + j * spacing
-                y = start_y + i * spacing
-                self.plots.append(FarmPlot(x, y))
+        # Camera over the farm; farms larger than the window scroll
+        self.camera = Camera((WINDOW_WIDTH, WINDOW_HEIGHT), self.plot_grid.bounds())
 
         self.sounds.play("click")
 
         # Particlesist ว่าง เพื่อเก็บวัตถุ Particle ทั้งหมดในเกม ณ ขณะนั้น
-        self.particles = []
+        self.particles = ParticleSystem(MAX_PARTICLES)
+        self.particles.load_presets(PARTICLE_PRESETS)
 
-        # Selected plot for planting
+        # Selected plot for planting, or the plot indices of a bulk planting
         self.selected_plot = None
+        self.selected_plots = None
+
+        # World position where a drag over the farm started
+        self.drag_start = None
+
+        # Background layers: sky/ground/flowers baked once, clouds per frame
+        self.background = BackgroundLayers()
+        # (looked up on each call, so the profiler's timed wrapper is used)
+        self.background.add_dynamic_layer(lambda surface: self.draw_clouds(surface))
 
         # Decorative elements เมฆสุดเท่ที่ฉาก
         self.clouds = []
         for i in range(5):
+            size = random.randint(40, 80)
+            sprite, anchor = self.background.get_cloud(size)
             self.clouds.append({
                 'x': random.randint(0, WINDOW_WIDTH),
                 'y': random.randint(50, 150),
                 'speed': random.uniform(0.3, 1.0),
-                'size': random.randint(40, 80)
+                'size': size,
+                'sprite': sprite,
+                'anchor': anchor
             })
 
-        # Animation timers
-        self.animation_timer = 0
+        # Decorative flowers, generated once from a fixed seed
+        flower_rng = random.Random(FLOWER_SEED)
+        self.flower_atlas = self.background.get_flower_atlas([PINK, RED, YELLOW, PURPLE])
+        self.flowers = []
+        for i in range(15):
+            self.flowers.append({
+                'x': 100 + i * 80,
+                'y': WINDOW_HEIGHT - 100 + flower_rng.randint(-20, 20),
+                'color': flower_rng.choice([PINK, RED, YELLOW, PURPLE])
+            })
+        self.background.add_static_layer(self.draw_flowers)
 
         # Sound settings
         self.music_enabled = True
@@ -169,9 +219,12 @@ class FarmGame:
         self.watering_mode = False
         self.fertilizing_mode = False
 
-        # Load saved game and settings
+        # Load settings; the save body is only read when a slot is continued
         self.load_settings()
-        self.load_game()
+
+        # Autosave (captures on this thread, writes on a worker thread)
+        self.autosave = AutosaveWorker(self)
+        self.manual_save = None  # (request, click position) of a Save button press
 
     def create_ui_elements(self):
         """Create all UI buttons and elements"""
@@ -184,6 +237,13 @@ class FarmGame:
         # Tool buttons
         self.water_button = pygame.Rect(50, 430, 180, 60)
         self.fertilize_button = pygame.Rect(50, 510, 180, 60)
+        self.all_plots_button = pygame.Rect(50, 590, 180, 60)
+
+        # Stats panel, and everything drawn over the farm that swallows clicks
+        self.stats_panel = pygame.Rect(10, 10, 280, 220)
+        self.main_ui_rects = [self.stats_panel, self.shop_button, self.inventory_button,
+                              self.save_button, self.settings_button, self.water_button,
+                              self.fertilize_button, self.all_plots_button]
 
         # Back button (universal)
         self.back_button = pygame.Rect(50, 700, 150, 60)
@@ -191,16 +251,20 @@ class FarmGame:
         # Start screen buttons
         self.new_game_button = pygame.Rect(WINDOW_WIDTH//2 - 200, 450, 400, 80)
         self.continue_button = pygame.Rect(WINDOW_WIDTH//2 - 200, 550, 400, 80)#กลางจอ
+        slot_width, slot_gap = 260, 20
+        slots_left = WINDOW_WIDTH//2 - (self.slots.slot_count * (slot_width + slot_gap) - slot_gap)//2
+        self.slot_buttons = [pygame.Rect(slots_left + i * (slot_width + slot_gap), 650, slot_width, 110)
+                             for i in range(self.slots.slot_count)]
 
         # Shop items with better layoutร้านค้า
         self.shop_items = []
         shop_x = 350
         shop_y = 250
         items = [
-            ("Durian Seeds", "durian_seeds", 30, 'durian_seed'),
-            ("Mangosteen Seeds", "mangosteen_seeds", 20, 'mangosteen_seed'),
-            ("Fertilizer", "fertilizer", 15, 'fertilizer'),
-            ("Premium Water Can", "water_can", 50, 'water_can')
+            ("Durian Seeds", "durian_seeds", SHOP_PRICES["durian_seeds"], 'durian_seed'),
+            ("Mangosteen Seeds", "mangosteen_seeds", SHOP_PRICES["mangosteen_seeds"], 'mangosteen_seed'),
+            ("Fertilizer", "fertilizer", SHOP_PRICES["fertilizer"], 'fertilizer'),
+            ("Premium Water Can", "water_can", SHOP_PRICES["water_can"], 'water_can')
         ]
 
         for i, (name, key, price, icon) in enumerate(items):
@@ -212,161 +276,81 @@ class FarmGame:
                 'rect': pygame.Rect(shop_x + (i % 2) * 300, shop_y + (i // 2) * 150, 280, 120)
             })
 
-    def get_item_from_inventory(self, key):
-        """Get item count from nested inventory structure"""
-        for category in self.inventory.values():
-            if key in category:
-                return category[key]
-        return 0
-    
-    def set_item_in_inventory(self, key, value):
-        """Set item count in nested inventory structure"""
-        for category in self.inventory.values():
-            if key in category:
-                category[key] = value
-                return
-    
-    def add_item_to_inventory(self, key, amount):
-        """Add item to nested inventory structure"""
-        for category in self.inventory.values():
-            if key in category:
-                category[key] += amount
-                return
-
-    def load_game(self):
-        """Load saved game data"""
-        try:
-            if os.path.exists(SAVE_FILE):#ตรวจสอบว่ามีไฟล์เซฟอยู่หรือไม่
-                with open(SAVE_FILE, 'r') as f:
-                    data = json.load(f)#เก็บข้อมูลjson
-                    self.coins = data.get('coins', 500)
-                    self.level = data.get('level', 1)
-                    self.xp = data.get('xp', 0)
-                    self.day = data.get('day', 1)
-                    
-                    # Convert old inventory format to new format if needed
-                    saved_inventory = data.get('inventory', {})
-                    if 'crops' in saved_inventory:
-                        self.inventory = saved_inventory
-                    else:
-                        # Old format - convert to new
-                        self.inventory = {
-                            "crops": {
-                                "durian": saved_inventory.get("durian", 0),
-                                "mangosteen": saved_inventory.get("mangosteen", 0)
-                            },
-                            "seeds": {
-                                "durian_seeds": saved_inventory.get("durian_seeds", 10),
-                                "mangosteen_seeds": saved_inventory.get("mangosteen_seeds", 10)
-                            },
-                            "tools": {
-                                "fertilizer": saved_inventory.get("fertilizer", 10),
-                                "water_can": saved_inventory.get("water_can", 10)
-                            }
-                        }
-
-                    # Load plots
-                    plot_data = data.get('plots', [])
-                    for i, plot_info in enumerate(plot_data):#loop list
-                        if i < len(self.plots):    # ตรวจสอบว่า index ไม่เกินจำนวนแปลงที่มีอยู่ใน self.plots
-                            self.plots[i].is_tilled = plot_info.get('tilled', False)#เช็คไถ
-                            self.plots[i].moisture = plot_info.get('moisture', 0)#เช็คชื้น
-
-                            if plot_info.get('has_crop'):#เก็บผัก
-                                crop_type = plot_info.get('crop_type')#เรียกชื่อผัก
-                                if crop_type in self.crop_types:
-                                    crop = Crop(self.crop_types[crop_type])
-                                    crop.growth_stage = plot_info.get('growth_stage', 0)  # โหลดสถานะการเติบโตของพืชจากเซฟ เช่น โตถึงขั้นไหนแล้ว (stage 0 - 3)
-                                    crop.watered = plot_info.get('watered', False)
-                                    crop.fertilized = plot_info.get('fertilized', False)
-                                    self.plots[i].crop = crop
-        except Exception as e:
-            print(f"Error loading save: {e}")
-
-    def save_game(self):
-        """Save game data"""
-        plot_data = []
-        for plot in self.plots:
-            plot_info = {
-                'tilled': plot.is_tilled,
-                'moisture': plot.moisture,
-                'has_crop': plot.crop is not None
-            }
-            if plot.crop:
-                plot_info['crop_type'] = plot.crop.type.name.lower()
-                plot_info['growth_stage'] = plot.crop.growth_stage
-                plot_info['watered'] = plot.crop.watered
-                plot_info['fertilized'] = plot.crop.fertilized
-            plot_data.append(plot_info)
-
-        save_data = {
-            'coins': self.coins,
-            'level': self.level,
-            'xp': self.xp,
-            'day': self.day,
-            'inventory': self.inventory,
-            'plots': plot_data,
-            'timestamp':datetime .now().isoformat()
-        }
-
-        try:
-            with open(SAVE_FILE, 'w') as f:
-                json.dump(save_data, f, indent=2)
-            print("Game saved successfully!")
-            return True
-        except Exception as e:
-            print(f"Error saving game: {e}")
-            return False
-
     def draw_background(self):
         """Draw beautiful background with gradient sky"""
-        # Gradient sky
-        for i in range(WINDOW_HEIGHT // 2):#loopครึ่งจอ
-            ratio = i / (WINDOW_HEIGHT // 2)#ไล่สี
-            r = int(135 + (255 - 135) * ratio)
-            g = int(206 + (255 - 206) * ratio)
-            b = int(250 + (255 - 250) * ratio)#ไล่สี
-            pygame.draw.line(self.screen, (r, g, b), (0, i), (WINDOW_WIDTH, i))
-
-        # Ground
-        pygame.draw.rect(self.screen, GRASS_GREEN, (0, WINDOW_HEIGHT // 2, WINDOW_WIDTH, WINDOW_HEIGHT // 2))
-
-        # Draw animated clouds
+        # Cached sky, ground and flowers, then clouds on top
+        self.background.draw(self.screen)
+
+    def draw_clouds(self, surface):
+        """Draw animated clouds"""
         for cloud in self.clouds:
-            self.draw_cloud(cloud['x'], cloud['y'], cloud['size'])
-            cloud['x'] += cloud['speed']
+            self.draw_cloud(cloud)
+
+    def cloud_rect(self, cloud):
+        """Screen area covered by a cloud"""
+        anchor_x, anchor_y = cloud['anchor']
+        return cloud['sprite'].get_rect(topleft=(int(cloud['x']) - anchor_x, cloud['y'] - anchor_y))
+
+    def render_time(self):
+        """Simulation time in ticks, interpolated between ticks for smooth animation"""
+        return self.animation_timer + self.sim_clock.alpha
+
+    def animated_screen(self):
+        """True on screens with moving scenery (clouds, crops, waving text)"""
+        return self.state in (GameState.START_SCREEN, GameState.MAIN)
+
+    def target_fps(self):
+        """Render rate: full speed on animated screens, throttled on static ones"""
+        if self.animated_screen():
+            return FPS
+        return IDLE_FPS
+
+    def animate(self):
+        """Advance decorative animations and report the regions they touch"""
+        # Scenery only moves on the start and main screens; elsewhere it
+        # stays put so a screen without input needs no frames at all
+        if not self.animated_screen():
+            self.renderer.stop_animation('scenery')
+            return
+        self.renderer.start_animation('scenery')
+
+        # Clouds move in real time, whatever the render rate
+        frames = self.frame_time * FPS
+        for cloud in self.clouds:
+            self.renderer.mark(self.cloud_rect(cloud))
+            cloud['x'] += cloud['speed'] * frames
             if cloud['x'] > WINDOW_WIDTH + 100:
                 cloud['x'] = -100
-
-        # Decorative flowers
-        for i in range(15):
-            x = 100 + i * 80
-            y = WINDOW_HEIGHT - 100 + random.randint(-20, 20)
-            self.draw_flower(x, y)
-
-    def draw_cloud(self, x, y, size):
-        """Draw fluffy cloud"""
-        for i in range(3):
-            for j in range(2):
-                offset_x = i * size//3 - size//3
-                offset_y = j * size//4 - size//8
-                circle_size = size//2 + random.randint(-5, 5)
-                pygame.draw.circle(self.screen, WHITE,
-                                 (int(x + offset_x), int(y + offset_y)), circle_size)
-
-    def draw_flower(self, x, y):
-        """Draw decorative flower"""
-        colors = [PINK, RED, YELLOW, PURPLE]
-        color = random.choice(colors)
-        # Stem
-        pygame.draw.line(self.screen, DARK_GREEN, (x, y), (x, y - 20), 3)
-        # Petals
-        for angle in range(0, 360, 60):
-            px = x + 10 * math.cos(math.radians(angle))
-            py = y - 20 + 10 * math.sin(math.radians(angle))
-            pygame.draw.circle(self.screen, color, (int(px), int(py)), 6)
-        # Center
-        pygame.draw.circle(self.screen, YELLOW, (x, y - 20), 4)
+            self.renderer.mark(self.cloud_rect(cloud))
+
+        if self.state == GameState.START_SCREEN:
+            # Waving welcome text: its whole range of motion (+1 px for rounding)
+            self.renderer.mark((0, WELCOME_Y - WELCOME_WAVE - 1, WINDOW_WIDTH,
+                                self.font_medium.get_linesize() + 2 * WELCOME_WAVE + 2))
+        elif self.state == GameState.MAIN:
+            # Arrow keys scroll the farm
+            keys = pygame.key.get_pressed()
+            dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * CAMERA_SPEED
+            dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * CAMERA_SPEED
+            if dx or dy:
+                self.camera.move(dx, dy)
+
+            # Crop bounce, particles and tool cursor
+            self.renderer.mark_full()
+
+    def draw_flowers(self, surface):
+        """Draw decorative flowers (baked into the static background)"""
+        for flower in self.flowers:
+            self.draw_flower(surface, flower)
+
+    def draw_cloud(self, cloud):
+        """Draw fluffy cloud from its baked sprite"""
+        self.screen.blit(cloud['sprite'], self.cloud_rect(cloud))
+
+    def draw_flower(self, surface, flower):
+        """Draw decorative flower from the sprite atlas"""
+        sprite, (anchor_x, anchor_y) = self.flower_atlas[flower['color']]
+        surface.blit(sprite, (flower['x'] - anchor_x, flower['y'] - anchor_y))
 
     def draw_start_screen(self):
         """Draw start screen with cat mascot"""
@@ -375,9 +359,9 @@ class FarmGame:
         # Title with shadow effect
         title_text = "VEGETABLES DAY"
         for i in range(3):
-            shadow = self.font_huge.render(title_text, True, BLACK)
+            shadow = self.text_cache.render(self.font_huge, title_text, True, BLACK)
             self.screen.blit(shadow, (WINDOW_WIDTH//2 - shadow.get_width()//2 + 3-i, 103-i))
-        title = self.font_huge.render(title_text, True, GOLDEN)
+        title = self.text_cache.render(self.font_huge, title_text, True, GOLDEN)
         self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
 
         # Draw cat mascot
@@ -386,37 +370,56 @@ class FarmGame:
         self.screen.blit(cat_img, cat_rect)
 
         # Animated welcome text
-        wave = math.sin(self.animation_timer * 0.05) * 10
-        welcome = self.font_medium.render("Welcome to your farm adventure!", True, WHITE)
-        self.screen.blit(welcome, (WINDOW_WIDTH//2 - welcome.get_width()//2, 420 + wave))
+        wave = math.sin(self.render_time() * 0.05) * WELCOME_WAVE
+        welcome = self.text_cache.render(self.font_medium, "Welcome to your farm adventure!", True, WHITE)
+        self.screen.blit(welcome, (WINDOW_WIDTH//2 - welcome.get_width()//2, WELCOME_Y + wave))
 
         # Beautiful buttons
         # New Game
         pygame.draw.rect(self.screen, LIGHT_GREEN, self.new_game_button, border_radius=20)
         pygame.draw.rect(self.screen, DARK_GREEN, self.new_game_button, 4, border_radius=20)
-        new_text = self.font_medium.render("🌱 New Game", True, WHITE)
+        new_text = self.text_cache.render(self.font_medium, "🌱 New Game", True, WHITE)
         self.screen.blit(new_text, (self.new_game_button.centerx - new_text.get_width()//2,
                                     self.new_game_button.centery - new_text.get_height()//2))
 
         # Continue (if save exists)
-        if os.path.exists(SAVE_FILE):
+        if self.has_save():
             pygame.draw.rect(self.screen, ORANGE, self.continue_button, border_radius=20)
             pygame.draw.rect(self.screen, UI_DARK, self.continue_button, 4, border_radius=20)
-            cont_text = self.font_medium.render("📂 Continue", True, WHITE)
+            cont_text = self.text_cache.render(self.font_medium, "📂 Continue", True, WHITE)
             self.screen.blit(cont_text, (self.continue_button.centerx - cont_text.get_width()//2,
                                         self.continue_button.centery - cont_text.get_height()//2))
 
+        self.draw_slot_cards()
+
+    def draw_slot_cards(self):
+        """Draw one card per save slot from the cached slot index"""
+        for slot, rect in enumerate(self.slot_buttons, start=1):
+            selected = slot == self.slot
+            pygame.draw.rect(self.screen, CREAM if selected else UI_BROWN, rect, border_radius=15)
+            pygame.draw.rect(self.screen, GOLDEN if selected else UI_DARK, rect, 4, border_radius=15)
+
+            info = self.slots.info(slot)
+            if info is None:
+                lines = [f"Slot {slot}", "Empty"]
+            else:
+                saved = (info['timestamp'] or "")[:16].replace("T", " ")
+                lines = [f"Slot {slot}", f"Day {info['day']} - Lv {info['level']} - {info['coins']} coins", saved]
+            for i, line in enumerate(lines):
+                font = self.font_small if i == 0 else self.font_tiny
+                text = self.text_cache.render(font, line, True, UI_DARK)
+                self.screen.blit(text, (rect.centerx - text.get_width()//2, rect.y + 12 + i * 30))
+
     def draw_ui_panel(self):
         """Draw main UI panel with stats"""
         # Main panel
-        panel = pygame.Rect(10, 10, 280, 220)
-        pygame.draw.rect(self.screen, CREAM, panel, border_radius=20)
-        pygame.draw.rect(self.screen, UI_DARK, panel, 4, border_radius=20)
+        pygame.draw.rect(self.screen, CREAM, self.stats_panel, border_radius=20)
+        pygame.draw.rect(self.screen, UI_DARK, self.stats_panel, 4, border_radius=20)
 
         # Draw coin with icon
         coin_img = self.images.get('coin', (32, 32))
         self.screen.blit(coin_img, (25, 25))
-        coin_text = self.font_small.render(f": ${self.coins}", True, BLACK)
+        coin_text = self.text_cache.render(self.font_small, f": ${self.coins}", True, BLACK)
         self.screen.blit(coin_text, (65, 30))
 
         # Stats
@@ -429,14 +432,16 @@ class FarmGame:
 
         y_offset = 70
         for stat in stats:# ข้อความหลายบรรทัดแนวตั้ง 
-            text = self.font_small.render(stat, True, BLACK)
+            text = self.text_cache.render(self.font_small, stat, True, BLACK)
             self.screen.blit(text, (25, y_offset))
             y_offset += 35
 
     def draw_farm_plot(self, plot):
         """Draw individual farm plot with effects"""
+        rect = self.camera.to_screen(plot.rect)
+
         # Shadow
-        shadow_rect = plot.rect.copy()
+        shadow_rect = rect.copy()
         shadow_rect.x += 5
         shadow_rect.y += 5
         pygame.draw.rect(self.screen, (0, 0, 0, 50), shadow_rect, border_radius=10)
@@ -445,32 +450,32 @@ class FarmGame:
         if plot.is_tilled:
             # Draw plot image
             plot_img = self.images.get('plot', (TILE_SIZE, TILE_SIZE))
-            self.screen.blit(plot_img, plot.rect)
+            self.screen.blit(plot_img, rect)
         else:
             # Untilled ground
-            pygame.draw.rect(self.screen, GRASS_GREEN, plot.rect, border_radius=10)
-            pygame.draw.rect(self.screen, DARK_GREEN, plot.rect, 3, border_radius=10)
+            pygame.draw.rect(self.screen, GRASS_GREEN, rect, border_radius=10)
+            pygame.draw.rect(self.screen, DARK_GREEN, rect, 3, border_radius=10)
 
         # Moisture effect
         if plot.moisture > 0 and plot.is_tilled:
             # Create darker wet soil effect
-            moisture_surf = pygame.Surface((plot.rect.width, plot.rect.height), pygame.SRCALPHA)
+            moisture_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
             alpha = int(plot.moisture * 0.5)  # Max 50% opacity
             moisture_surf.fill((*SKY_BLUE, alpha))
-            self.screen.blit(moisture_surf, plot.rect)
+            self.screen.blit(moisture_surf, rect)
 
         # Draw crop
         if plot.crop:
-            self.draw_crop(plot)
+            self.draw_crop(plot, rect)
 
-    def draw_crop(self, plot):
+    def draw_crop(self, plot, rect):
         """Draw crop with growth animation"""
         crop = plot.crop
-        center_x = plot.rect.centerx
-        center_y = plot.rect.centery
+        center_x = rect.centerx
+        center_y = rect.centery
 
         # Growth animation
-        bounce = math.sin(self.animation_timer * 0.1) * 2
+        bounce = math.sin(self.render_time() * 0.1) * 2
 
         if crop.type.name == "Durian":
             if crop.growth_stage == 0:
@@ -503,16 +508,20 @@ class FarmGame:
         # Ready indicator
         if crop.is_ready():
             # Glowing effectบิกเก็บผักได้ 
-            glow_size = 15 + math.sin(self.animation_timer * 0.01) * 5
+            glow_size = 15 + math.sin(self.render_time() * 0.01) * 5
             pygame.draw.circle(self.screen, GOLDEN, (center_x + 40, center_y - 40), int(glow_size))
             pygame.draw.circle(self.screen, YELLOW, (center_x + 40, center_y - 40), 12)
-            ready_text = self.font_tiny.render("!", True, BLACK)
+            ready_text = self.text_cache.render(self.font_tiny, "!", True, BLACK)
             self.screen.blit(ready_text, (center_x + 36, center_y - 48))
 
     def draw_main_game(self):
         """Draw main game screen"""
         self.draw_background()
 
+        # Draw farm plots, culled to the camera view (under the UI)
+        for plot in self.plot_grid.plots_in_rect(self.camera.view_rect()):
+            self.draw_farm_plot(plot)
+
         # Draw UI panel
         self.draw_ui_panel()
 
@@ -523,7 +532,8 @@ class FarmGame:
             (self.save_button, " Save", LIGHT_GREEN),
             (self.settings_button, " Settings", UI_BROWN),
             (self.water_button, " Water", SKY_BLUE),
-            (self.fertilize_button, " Fertilize", DARK_GREEN)
+            (self.fertilize_button, " Fertilize", DARK_GREEN),
+            (self.all_plots_button, " All Plots", GOLDEN)
         ]
 
         for button, text, color in buttons:
@@ -543,20 +553,18 @@ class FarmGame:
             pygame.draw.rect(self.screen, BLACK, button, 3, border_radius=15)
 
             # Text
-            btn_text = self.font_small.render(text, True, WHITE)
+            btn_text = self.text_cache.render(self.font_small, text, True, WHITE)
             self.screen.blit(btn_text, (button.centerx - btn_text.get_width()//2,
                                        button.centery - btn_text.get_height()//2))
 
-        # Draw farm plots
-        for plot in self.plots:
-            self.draw_farm_plot(plot)
+        # Draw the drag selection
+        if self.drag_start is not None:
+            selection = self.drag_rect(pygame.mouse.get_pos())
+            if max(selection.size) >= DRAG_THRESHOLD:
+                pygame.draw.rect(self.screen, YELLOW, self.camera.to_screen(selection), 3)
 
-        # Draw particlesสร้ามสำเนา ob ตอบลบจะได้ไม่รวน
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        # Draw particles (updated in the simulation tick)
+        self.particles.draw(self.screen)
 
         # Draw active tool cursor ตอนกดปุ๋ยกับน้ำ
         if self.watering_mode or self.fertilizing_mode:
@@ -586,7 +594,7 @@ class FarmGame:
         pygame.draw.rect(self.screen, UI_DARK, sign_rect, 4, border_radius=20)
 
         # Title
-        title = self.font_large.render("FARM SHOP", True, WHITE)
+        title = self.text_cache.render(self.font_large, "FARM SHOP", True, WHITE)
         self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
 
         # Coins display
@@ -595,7 +603,7 @@ class FarmGame:
         pygame.draw.rect(self.screen, BLACK, coin_bg, 3, border_radius=15)
         coin_img = self.images.get('coin', (40, 40))
         self.screen.blit(coin_img, (870, 190))
-        coin_text = self.font_medium.render(f"${self.coins}", True, BLACK)
+        coin_text = self.text_cache.render(self.font_medium, f"${self.coins}", True, BLACK)
         self.screen.blit(coin_text, (920, 195))
 
         # Shop items
@@ -609,8 +617,8 @@ class FarmGame:
             self.screen.blit(icon, (item['rect'].x + 10, item['rect'].centery - 30))
 
             # Item name and price
-            name_text = self.font_small.render(item['name'], True, BLACK)
-            price_text = self.font_medium.render(f"${item['price']}", True, DARK_GREEN)
+            name_text = self.text_cache.render(self.font_small, item['name'], True, BLACK)
+            price_text = self.text_cache.render(self.font_medium, f"${item['price']}", True, DARK_GREEN)
 
             self.screen.blit(name_text, (item['rect'].x + 80, item['rect'].y + 20))
             self.screen.blit(price_text, (item['rect'].x + 80, item['rect'].y + 55))
@@ -620,7 +628,7 @@ class FarmGame:
             btn_color = LIGHT_GREEN if self.coins >= item['price'] else GRAY
             pygame.draw.rect(self.screen, btn_color, buy_btn, border_radius=10)
             pygame.draw.rect(self.screen, BLACK, buy_btn, 2, border_radius=10)
-            buy_text = self.font_tiny.render("BUY", True, WHITE)
+            buy_text = self.text_cache.render(self.font_tiny, "BUY", True, WHITE)
             self.screen.blit(buy_text, (buy_btn.centerx - buy_text.get_width()//2,
                                        buy_btn.centery - buy_text.get_height()//2))
 
@@ -641,7 +649,7 @@ class FarmGame:
         pygame.draw.rect(self.screen, DARK_GREEN, title_bg, border_radius=20)
 
         # Title
-        title = self.font_large.render("INVENTORY", True, WHITE)
+        title = self.text_cache.render(self.font_large, "INVENTORY", True, WHITE)
         self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 85))
 
         # Tab buttons
@@ -666,7 +674,7 @@ class FarmGame:
             pygame.draw.rect(self.screen, tab_color, tab_rect, border_radius=15)
             pygame.draw.rect(self.screen, BLACK, tab_rect, 2, border_radius=15)
 
-            text = self.font_small.render(tab_text, True, BLACK)
+            text = self.text_cache.render(self.font_small, tab_text, True, BLACK)
             self.screen.blit(text, (tab_rect.centerx - text.get_width()//2,
                                    tab_rect.centery - text.get_height()//2))
             tab_x += 220
@@ -676,7 +684,7 @@ class FarmGame:
         sell_color = RED if self.sell_mode else GRAY
         pygame.draw.rect(self.screen, sell_color, sell_toggle_rect, border_radius=15)
         pygame.draw.rect(self.screen, BLACK, sell_toggle_rect, 2, border_radius=15)
-        sell_text = self.font_small.render("💰 Sell", True, WHITE)
+        sell_text = self.text_cache.render(self.font_small, "💰 Sell", True, WHITE)
         self.screen.blit(sell_text, (sell_toggle_rect.centerx - sell_text.get_width()//2,
                                      sell_toggle_rect.centery - sell_text.get_height()//2))
 
@@ -690,10 +698,18 @@ class FarmGame:
         # Back button
         self.draw_back_button()
 
+    def stocked_items(self, category):
+        """{key: count} of the items in stock in a category, cached until the inventory changes"""
+        items = self._stocked_items.get(category)
+        if items is None:
+            items = {key: count for key, count in self.inventory.category(category).items() if count > 0}
+            self._stocked_items[category] = items
+        return items
+
     def draw_inventory_items(self):
         """Draw items in grid layout"""
         # Get current tab items
-        current_items = self.inventory.get(self.inventory_tab, {})
+        current_items = self.stocked_items(self.inventory_tab)
         
         # Grid settings
         grid_x = 200
@@ -747,7 +763,7 @@ class FarmGame:
                 pygame.draw.ellipse(self.screen, BLACK, count_bg)
                 pygame.draw.ellipse(self.screen, GOLDEN, count_bg.inflate(-4, -4))
                 
-                count_text = self.font_tiny.render(str(count), True, BLACK)
+                count_text = self.text_cache.render(self.font_tiny, str(count), True, BLACK)
                 count_rect = count_text.get_rect(center=count_bg.center)
                 self.screen.blit(count_text, count_rect)
                 
@@ -775,7 +791,7 @@ class FarmGame:
         
         # Item name
         item_display_name = self.selected_item.replace('_', ' ').title()
-        name_text = self.font_medium.render(item_display_name, True, BLACK)
+        name_text = self.text_cache.render(self.font_medium, item_display_name, True, BLACK)
         self.screen.blit(name_text, (320, 510))
         
         # Get item info
@@ -790,7 +806,7 @@ class FarmGame:
                 desc = "A sweet purple fruit. Sells for $60"
                 sell_price = 60
                 
-            desc_text = self.font_small.render(desc, True, DARK_GRAY)
+            desc_text = self.text_cache.render(self.font_small, desc, True, DARK_GRAY)
             self.screen.blit(desc_text, (320, 550))
             
             # Quantity and sell controls
@@ -803,19 +819,19 @@ class FarmGame:
                 # - button
                 minus_btn = pygame.Rect(330, 595, 30, 30)
                 pygame.draw.rect(self.screen, RED, minus_btn, border_radius=5)
-                minus_text = self.font_medium.render("-", True, WHITE)
+                minus_text = self.text_cache.render(self.font_medium, "-", True, WHITE)
                 self.screen.blit(minus_text, (minus_btn.centerx - minus_text.get_width()//2,
                                              minus_btn.centery - minus_text.get_height()//2 - 3))
                 
                 # Quantity display
-                qty_text = self.font_small.render(str(self.sell_quantity), True, BLACK)
+                qty_text = self.text_cache.render(self.font_small, str(self.sell_quantity), True, BLACK)
                 self.screen.blit(qty_text, (qty_rect.centerx - qty_text.get_width()//2,
                                            qty_rect.centery - qty_text.get_height()//2))
                 
                 # + button
                 plus_btn = pygame.Rect(480, 595, 30, 30)
                 pygame.draw.rect(self.screen, GREEN, plus_btn, border_radius=5)
-                plus_text = self.font_medium.render("+", True, WHITE)
+                plus_text = self.text_cache.render(self.font_medium, "+", True, WHITE)
                 self.screen.blit(plus_text, (plus_btn.centerx - plus_text.get_width()//2,
                                            plus_btn.centery - plus_text.get_height()//2 - 3))
                 
@@ -824,7 +840,7 @@ class FarmGame:
                 sell_value = sell_price * self.sell_quantity
                 pygame.draw.rect(self.screen, GOLDEN, sell_btn, border_radius=10)
                 pygame.draw.rect(self.screen, BLACK, sell_btn, 2, border_radius=10)
-                sell_btn_text = self.font_small.render(f"Sell for ${sell_value}", True, BLACK)
+                sell_btn_text = self.text_cache.render(self.font_small, f"Sell for ${sell_value}", True, BLACK)
                 self.screen.blit(sell_btn_text, (sell_btn.centerx - sell_btn_text.get_width()//2,
                                                 sell_btn.centery - sell_btn_text.get_height()//2))
                 
@@ -835,10 +851,10 @@ class FarmGame:
                 
         elif self.inventory_tab == "seeds":
             desc = f"Plant these to grow {self.selected_item.replace('_seeds', '')}!"
-            desc_text = self.font_small.render(desc, True, DARK_GRAY)
+            desc_text = self.text_cache.render(self.font_small, desc, True, DARK_GRAY)
             self.screen.blit(desc_text, (320, 550))
             
-            stock_text = self.font_small.render(f"In stock: {count}", True, BLACK)
+            stock_text = self.text_cache.render(self.font_small, f"In stock: {count}", True, BLACK)
             self.screen.blit(stock_text, (320, 590))
             
         elif self.inventory_tab == "tools":
@@ -847,10 +863,10 @@ class FarmGame:
             else:
                 desc = "Essential for watering your crops"
                 
-            desc_text = self.font_small.render(desc, True, DARK_GRAY)
+            desc_text = self.text_cache.render(self.font_small, desc, True, DARK_GRAY)
             self.screen.blit(desc_text, (320, 550))
             
-            stock_text = self.font_small.render(f"Remaining: {count}", True, BLACK)
+            stock_text = self.text_cache.render(self.font_small, f"Remaining: {count}", True, BLACK)
             self.screen.blit(stock_text, (320, 590))
 
     def draw_planting_menu(self):
@@ -863,7 +879,7 @@ class FarmGame:
         pygame.draw.rect(self.screen, UI_DARK, menu_bg, 5, border_radius=30)
 
         # Title
-        title = self.font_medium.render("Select Seed to Plant", True, BLACK)
+        title = self.text_cache.render(self.font_medium, "Select Seed to Plant", True, BLACK)
         self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 230))
 
         # Seed options
@@ -886,8 +902,8 @@ class FarmGame:
             self.screen.blit(seed_img, (x - 40, y - 60))
 
             # Text
-            name_text = self.font_small.render(name, True, WHITE)
-            count_text = self.font_small.render(f"x{count}", True, WHITE)
+            name_text = self.text_cache.render(self.font_small, name, True, WHITE)
+            count_text = self.text_cache.render(self.font_small, f"x{count}", True, WHITE)
 
             self.screen.blit(name_text, (x - name_text.get_width()//2, y + 30))
             self.screen.blit(count_text, (x - count_text.get_width()//2, y + 60))
@@ -904,11 +920,11 @@ class FarmGame:
         pygame.draw.rect(self.screen, UI_DARK, panel, 5, border_radius=30)
 
         # Title
-        title = self.font_large.render("⚙️ SETTINGS", True, BLACK)
+        title = self.text_cache.render(self.font_large, "⚙️ SETTINGS", True, BLACK)
         self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 130))
 
         # Music Volume
-        music_text = self.font_medium.render("🎵 Music Volume", True, BLACK)
+        music_text = self.text_cache.render(self.font_medium, "🎵 Music Volume", True, BLACK)
         self.screen.blit(music_text, (300, 240))
 
         # Music slider background
@@ -927,19 +943,19 @@ class FarmGame:
         pygame.draw.circle(self.screen, BLACK, (handle_x, self.music_slider_rect.centery), 15, 2)
 
         # Music percentage
-        music_percent = self.font_small.render(f"{int(self.sounds.music_volume * 100)}%", True, BLACK)
+        music_percent = self.text_cache.render(self.font_small, f"{int(self.sounds.music_volume * 100)}%", True, BLACK)
         self.screen.blit(music_percent, (self.music_slider_rect.right + 20, self.music_slider_rect.centery - 10))
 
         # Music toggle button
         toggle_color = LIGHT_GREEN if self.music_enabled else RED
         pygame.draw.rect(self.screen, toggle_color, self.music_toggle_rect, border_radius=20)
         pygame.draw.rect(self.screen, BLACK, self.music_toggle_rect, 3, border_radius=20)
-        toggle_text = self.font_small.render("ON" if self.music_enabled else "OFF", True, WHITE)
+        toggle_text = self.text_cache.render(self.font_small, "ON" if self.music_enabled else "OFF", True, WHITE)
         self.screen.blit(toggle_text, (self.music_toggle_rect.centerx - toggle_text.get_width()//2,
                                        self.music_toggle_rect.centery - toggle_text.get_height()//2))
 
         # Sound Effects Volume
-        sfx_text = self.font_medium.render("🔊 Sound Effects", True, BLACK)
+        sfx_text = self.text_cache.render(self.font_medium, "🔊 Sound Effects", True, BLACK)
         self.screen.blit(sfx_text, (300, 340))
 
         # SFX slider background
@@ -958,14 +974,14 @@ class FarmGame:
         pygame.draw.circle(self.screen, BLACK, (sfx_handle_x, self.sfx_slider_rect.centery), 15, 2)
 
         # SFX percentage
-        sfx_percent = self.font_small.render(f"{int(self.sounds.sfx_volume * 100)}%", True, BLACK)
+        sfx_percent = self.text_cache.render(self.font_small, f"{int(self.sounds.sfx_volume * 100)}%", True, BLACK)
         self.screen.blit(sfx_percent, (self.sfx_slider_rect.right + 20, self.sfx_slider_rect.centery - 10))
 
         # SFX toggle button
         sfx_toggle_color = LIGHT_GREEN if self.sfx_enabled else RED
         pygame.draw.rect(self.screen, sfx_toggle_color, self.sfx_toggle_rect, border_radius=20)
         pygame.draw.rect(self.screen, BLACK, self.sfx_toggle_rect, 3, border_radius=20)
-        sfx_toggle_text = self.font_small.render("ON" if self.sfx_enabled else "OFF", True, WHITE)
+        sfx_toggle_text = self.text_cache.render(self.font_small, "ON" if self.sfx_enabled else "OFF", True, WHITE)
         self.screen.blit(sfx_toggle_text, (self.sfx_toggle_rect.centerx - sfx_toggle_text.get_width()//2,
                                            self.sfx_toggle_rect.centery - sfx_toggle_text.get_height()//2))
 
@@ -977,64 +993,57 @@ class FarmGame:
             " Settings are saved automatically"
         ]
         for instruction in instructions:
-            inst_text = self.font_small.render(instruction, True, BLACK)
+            inst_text = self.text_cache.render(self.font_small, instruction, True, BLACK)
             self.screen.blit(inst_text, (WINDOW_WIDTH//2 - inst_text.get_width()//2, inst_y))
             inst_y += 40
 
         # Back button
         self.draw_back_button()
 
+    def draw_screen(self):
+        """Draw the screen of the current state"""
+        if self.state == GameState.START_SCREEN:
+            self.draw_start_screen()
+        elif self.state == GameState.MAIN:
+            self.draw_main_game()
+        elif self.state == GameState.SHOP:
+            self.draw_shop()
+        elif self.state == GameState.INVENTORY:
+            self.draw_inventory()
+        elif self.state == GameState.PLANTING:
+            self.draw_planting_menu()
+        elif self.state == GameState.SETTINGS:
+            self.draw_settings()
+
     def draw_back_button(self):
         """Draw universal back button"""
         pygame.draw.rect(self.screen, RED, self.back_button, border_radius=15)
         pygame.draw.rect(self.screen, BLACK, self.back_button, 3, border_radius=15)
-        back_text = self.font_small.render("← Back", True, WHITE)
+        back_text = self.text_cache.render(self.font_small, "← Back", True, WHITE)
         self.screen.blit(back_text, (self.back_button.centerx - back_text.get_width()//2,
                                      self.back_button.centery - back_text.get_height()//2))
 
-    def create_particles(self, x, y, particle_type):
-        """Create particle effects"""
-        if particle_type == "water":
-            for _ in range(15):
-                vx = random.uniform(-3, 3)
-                vy = random.uniform(-5, -2)
-                self.particles.append(Particle(x, y, SKY_BLUE, (vx, vy), 40, 4))
-
-        elif particle_type == "harvest":
-            colors = [GOLDEN, YELLOW, ORANGE]
-            for _ in range(20):
-                vx = random.uniform(-4, 4)
-                vy = random.uniform(-6, -2)
-                color = random.choice(colors)
-                self.particles.append(Particle(x, y, color, (vx, vy), 50, 5))
-
-        elif particle_type == "plant":
-            for _ in range(10):
-                vx = random.uniform(-2, 2)
-                vy = random.uniform(-3, -1)
-                self.particles.append(Particle(x, y, LIGHT_GREEN, (vx, vy), 30, 3))
-
-        elif particle_type == "fertilize":
-            for _ in range(12):
-                vx = random.uniform(-3, 3)
-                vy = random.uniform(-4, -2)
-                self.particles.append(Particle(x, y, BROWN, (vx, vy), 35, 4))
-
-        elif particle_type == "coin":
-            for _ in range(8):
-                vx = random.uniform(-2, 2)
-                vy = random.uniform(-5, -3)
-                self.particles.append(Particle(x, y, GOLDEN, (vx, vy), 40, 6))
-
-    def handle_events(self):
+    def create_particles(self, x, y, particle_type, scale=1):
+        """Create particle effects (only the farm screen draws them)"""
+        if self.state == GameState.MAIN and self.particles.emit_preset(particle_type, x, y, scale):
+            self.renderer.start_animation('particles')
+
+    def handle_events(self, events=()):
         """Handle all game eventsไว้จัดการทุกสถานการ"""
-        for event in pygame.event.get():
+        # `events` were already taken off the queue (e.g. the one that ended an idle wait)
+        for event in itertools.chain(events, pygame.event.get()):
+            # Any input may change what is on screen
+            self.renderer.mark_full()
+
             if event.type == pygame.QUIT:
-                self.save_game()
+                # Nothing was loaded or played yet on the start screen
+                if self.state != GameState.START_SCREEN:
+                    self.autosave.save()
+                self.autosave.close()
                 self.save_settings()
                 self.running = False
 
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button not in WHEEL_BUTTONS:
                 mouse_pos = pygame.mouse.get_pos()
                 self.sounds.play('click')
 
@@ -1042,11 +1051,17 @@ class FarmGame:
                     if self.new_game_button.collidepoint(mouse_pos):
                         self.reset_game()
                         self.state = GameState.MAIN
-                    elif self.continue_button.collidepoint(mouse_pos) and os.path.exists(SAVE_FILE):
+                    elif (self.continue_button.collidepoint(mouse_pos)
+                          and self.slots.verify(self.slot)):
+                        self.load_game()
                         self.state = GameState.MAIN
+                    else:
+                        for slot, rect in enumerate(self.slot_buttons, start=1):
+                            if rect.collidepoint(mouse_pos):
+                                self.select_slot(slot)
 
                 elif self.state == GameState.MAIN:
-                    self.handle_main_click(mouse_pos)
+                    self.handle_main_click(mouse_pos, event.button)
 
                 elif self.state == GameState.SHOP:
                     self.handle_shop_click(mouse_pos)
@@ -1060,9 +1075,21 @@ class FarmGame:
                 elif self.state == GameState.SETTINGS:
                     self.handle_settings_click(mouse_pos)
 
-            elif event.type == pygame.MOUSEBUTTONUP:
+            elif event.type == pygame.KEYDOWN:
+                if event.key == PROFILE_KEY:
+                    self.toggle_profiler()
+                elif event.key == PROFILE_EXPORT_KEY:
+                    self.export_profile()
+
+            elif event.type == pygame.MOUSEWHEEL:
+                if self.state == GameState.MAIN:
+                    self.camera.move(-event.x * TILE_SIZE, -event.y * TILE_SIZE)
+
+            elif event.type == pygame.MOUSEBUTTONUP and event.button not in WHEEL_BUTTONS:
                 self.dragging_music = False
                 self.dragging_sfx = False
+                if event.button == 1 and self.drag_start is not None:
+                    self.finish_drag(pygame.mouse.get_pos())
 
             elif event.type == pygame.MOUSEMOTION:
                 if self.state == GameState.SETTINGS:
@@ -1078,13 +1105,14 @@ class FarmGame:
                         volume = max(0, min(1, relative_x / self.sfx_slider_rect.width))
                         self.sounds.set_sfx_volume(volume)
 
-    def handle_main_click(self, mouse_pos):
-        """Handle clicks on main game screen"""
+    def handle_main_click(self, mouse_pos, button=1):
+        """Handle clicks on main game screen (plots only react to the left button)"""
         # UI Buttons
         if self.shop_button.collidepoint(mouse_pos):
             self.state = GameState.SHOP
             self.watering_mode = False
             self.fertilizing_mode = False
+            return
         elif self.inventory_button.collidepoint(mouse_pos):
             self.state = GameState.INVENTORY
             self.watering_mode = False
@@ -1092,13 +1120,17 @@ class FarmGame:
             self.selected_item = None
             self.sell_mode = False
             self.sell_quantity = 1
+            return
         elif self.save_button.collidepoint(mouse_pos):
-            if self.save_game():
-                self.create_particles(mouse_pos[0], mouse_pos[1], "coin")
+            # Feedback waits for the background write (see check_manual_save)
+            self.manual_save = (self.autosave.save(), mouse_pos)
+            self.renderer.start_animation('save')
+            return
         elif self.settings_button.collidepoint(mouse_pos):
             self.state = GameState.SETTINGS
             self.watering_mode = False
             self.fertilizing_mode = False
+            return
         elif self.water_button.collidepoint(mouse_pos):
             self.watering_mode = not self.watering_mode
             self.fertilizing_mode = False
@@ -1107,41 +1139,96 @@ class FarmGame:
             self.fertilizing_mode = not self.fertilizing_mode
             self.watering_mode = False
             return
+        elif self.all_plots_button.collidepoint(mouse_pos):
+            self.apply_to_plots(self.plot_indices())
+            return
+
+        # The farm scrolls under the UI: only clicks outside it reach the plots
+        if any(rect.collidepoint(mouse_pos) for rect in self.main_ui_rects):
+            return
+
+        # Farm plots: act on release, on one plot or on a dragged rectangle
+        world_pos = self.camera.to_world(mouse_pos)
+        if (button == 1 and self.state == GameState.MAIN and
+                pygame.Rect(self.plot_grid.bounds()).collidepoint(world_pos)):
+            self.drag_start = world_pos
+
+    def drag_rect(self, mouse_pos):
+        """World rect between the drag start and the mouse"""
+        (start_x, start_y), (x, y) = self.drag_start, self.camera.to_world(mouse_pos)
+        return pygame.Rect(min(start_x, x), min(start_y, y), abs(x - start_x) + 1, abs(y - start_y) + 1)
+
+    def finish_drag(self, mouse_pos):
+        """Act on the plot clicked, or on every plot in the dragged rectangle"""
+        selection = self.drag_rect(mouse_pos)
+        start, self.drag_start = self.drag_start, None
+        if max(selection.size) >= DRAG_THRESHOLD:
+            self.apply_to_plots(self.plot_grid.indices_in_rect(selection))
+        else:
+            self.click_plot(start)
+
+    def apply_to_plots(self, indices):
+        """Bulk version of a plot click on every eligible plot at indices.
+
+        The active tool waters or fertilizes them; otherwise untilled plots
+        are tilled and ready crops harvested, and if there was neither, the
+        planting menu opens for the empty plots. Each action changes the
+        farm in one batch and plays one effect for all of its plots.
+        """
+        if self.watering_mode:
+            self.bulk_effect(self.water_plots(indices), "water", 'water')
+        elif self.fertilizing_mode:
+            self.bulk_effect(self.fertilize_plots(indices), "fertilize", 'plant')
+        else:
+            tilled = self.till_plots(indices)
+            harvested = self.harvest_plots(indices)
+            self.bulk_effect(tilled, None, 'plant')
+            self.bulk_effect(harvested, "harvest", 'harvest')
+            store = self.plot_grid.store
+            empty = indices[store.tilled[indices] & (store.crop[indices] == NO_CROP)]
+            if not len(tilled) and not len(harvested) and len(empty):
+                self.selected_plots = empty
+                self.state = GameState.PLANTING
+
+    def bulk_effect(self, indices, particle_type, sound):
+        """One particle burst (scaled with the plot count) and one sound for a bulk action"""
+        if not len(indices):
+            return
+        if particle_type is not None:
+            center_x, center_y = self.camera.to_screen(self.plot_grid.bounding_rect(indices)).center
+            self.create_particles(center_x, center_y, particle_type, min(len(indices), BULK_EFFECT_SCALE))
+        self.sounds.play(sound)
+
+    def click_plot(self, world_pos):
+        """Act on the single plot at world_pos"""
+        plot = self.plot_grid.plot_at(world_pos)
+        if plot is not None:
+            center_x, center_y = self.camera.to_screen(plot.rect).center
+            if self.watering_mode:
+                self.water_plot(plot)
+                self.create_particles(center_x, center_y, "water")
+                self.sounds.play('water')
 
-        # Farm plots
-        for plot in self.plots:
-            if plot.rect.collidepoint(mouse_pos):
-                if self.watering_mode:
-                    plot.water()
-                    self.create_particles(plot.rect.centerx, plot.rect.centery, "water")
-                    self.sounds.play('water')
-
-                elif self.fertilizing_mode:
-                    if plot.crop and self.get_item_from_inventory("fertilizer") > 0:
-                        plot.fertilize()
-                        self.add_item_to_inventory("fertilizer", -1)
-                        self.create_particles(plot.rect.centerx, plot.rect.centery, "fertilize")
-                        self.sounds.play('plant')
-
-                elif not plot.is_tilled:
-                    plot.till()
+            elif self.fertilizing_mode:
+                if self.fertilize_plot(plot):
+                    self.create_particles(center_x, center_y, "fertilize")
                     self.sounds.play('plant')
 
-                elif plot.crop and plot.crop.is_ready():
-                    harvested = plot.harvest()
-                    if harvested:
-                        self.add_item_to_inventory(harvested.type.name.lower(), 1)
-                        self.coins += harvested.type.sell_price
-                        self.xp += 10
-                        self.check_level_up()
-                        self.create_particles(plot.rect.centerx, plot.rect.centery, "harvest")
-                        self.sounds.play('harvest')
-
-                elif not plot.crop:
-                    self.selected_plot = plot
-                    self.state = GameState.PLANTING
-                    self.watering_mode = False
-                    self.fertilizing_mode = False
+            elif not plot.is_tilled:
+                self.till_plot(plot)
+                self.sounds.play('plant')
+
+            elif plot.crop and plot.crop.is_ready():
+                if self.harvest_plot(plot):
+                    self.create_particles(center_x, center_y, "harvest")
+                    self.sounds.play('harvest')
+
+            elif not plot.crop:
+                self.selected_plot = plot
+                self.selected_plots = None
+                self.state = GameState.PLANTING
+                self.watering_mode = False
+                self.fertilizing_mode = False
 
     def handle_shop_click(self, mouse_pos):
         """Handle shop interactions"""
@@ -1152,9 +1239,7 @@ class FarmGame:
         # Check shop items
         for item in self.shop_items:
             buy_btn = pygame.Rect(item['rect'].right - 80, item['rect'].centery - 20, 60, 40)
-            if buy_btn.collidepoint(mouse_pos) and self.coins >= item['price']:
-                self.coins -= item['price']
-                self.add_item_to_inventory(item['key'], 1)
+            if buy_btn.collidepoint(mouse_pos) and self.buy_item(item['key'], item['price']):
                 self.create_particles(mouse_pos[0], mouse_pos[1], "coin")
                 self.sounds.play('coin')
 
@@ -1200,16 +1285,12 @@ class FarmGame:
                 self.sell_quantity = min(max_qty, self.sell_quantity + 1)
             elif hasattr(self, 'sell_btn') and self.sell_btn.collidepoint(mouse_pos):
                 # Sell items
-                count = self.get_item_from_inventory(self.selected_item)
-                if count >= self.sell_quantity:
-                    if self.selected_item == "durian":
-                        sell_price = 100
-                    else:
-                        sell_price = 60
-                    
-                    total_value = sell_price * self.sell_quantity
-                    self.add_item_to_inventory(self.selected_item, -self.sell_quantity)
-                    self.coins += total_value
+                if self.selected_item == "durian":
+                    sell_price = 100
+                else:
+                    sell_price = 60
+
+                if self.sell_item(self.selected_item, self.sell_quantity, sell_price):
                     self.create_particles(mouse_pos[0], mouse_pos[1], "coin")
                     self.sounds.play('coin')
                     
@@ -1231,11 +1312,12 @@ class FarmGame:
 
         for crop_type, seed_key, rect in seeds:
             if rect.collidepoint(mouse_pos) and self.get_item_from_inventory(seed_key) > 0:
-                crop = Crop(self.crop_types[crop_type])
-                if self.selected_plot.plant(crop):
-                    self.add_item_to_inventory(seed_key, -1)
-                    self.create_particles(self.selected_plot.rect.centerx,
-                                        self.selected_plot.rect.centery, "plant")
+                if self.selected_plots is not None:
+                    self.bulk_effect(self.plant_plots(crop_type, self.selected_plots), "plant", 'plant')
+                    self.selected_plots = None
+                elif self.plant_plot(self.selected_plot, crop_type):
+                    center_x, center_y = self.camera.to_screen(self.selected_plot.rect).center
+                    self.create_particles(center_x, center_y, "plant")
                     self.sounds.play('plant')
                 self.state = GameState.MAIN
 
@@ -1278,12 +1360,13 @@ class FarmGame:
                 self.dragging_sfx = True
 
     def save_settings(self):
-        """Save sound settings to file"""
+        """Save sound settings and the save format to file"""
         settings = {
             'music_volume': self.sounds.music_volume,
             'sfx_volume': self.sounds.sfx_volume,
             'music_enabled': self.music_enabled,
-            'sfx_enabled': self.sfx_enabled
+            'sfx_enabled': self.sfx_enabled,
+            'binary_save': self.binary_save
         }
         try:
             with open('settings.json', 'w') as f:
@@ -1292,7 +1375,7 @@ class FarmGame:
             pass
 
     def load_settings(self):
-        """Load sound settings from file"""
+        """Load sound settings and the save format from file"""
         try:
             if os.path.exists('settings.json'):
                 with open('settings.json', 'r') as f:
@@ -1302,80 +1385,111 @@ class FarmGame:
                     self.music_enabled = settings.get('music_enabled', True)
                     self.sfx_enabled = settings.get('sfx_enabled', True)
                     self.sounds.sfx_enabled = self.sfx_enabled
+                    self.binary_save = settings.get('binary_save', False)
 
                     if not self.music_enabled:
                         pygame.mixer.music.pause()
         except:
             pass
 
-    def check_level_up(self):
-        """Check and handle level up"""
-        if self.xp >= 100:
-            self.level += 1
-            self.xp -= 100
-            self.coins += 50 * self.level
-            # Could add more rewards here
-
-    def reset_game(self):
-        """Reset game to initial state"""
-        self.coins = 500
-        self.level = 1
-        self.xp = 0
-        self.day = 1
-        self.inventory = {
-            "crops": {
-                "durian": 0,
-                "mangosteen": 0
-            },
-            "seeds": {
-                "durian_seeds": 10,
-                "mangosteen_seeds": 10
-            },
-            "tools": {
-                "fertilizer": 10,
-                "water_can": 10
-            }
-        }
-        for plot in self.plots:
-            plot.is_tilled = False
-            plot.crop = None
-            plot.moisture = 0
-
     def update(self):
         """Update game state"""
-        self.animation_timer += 1
+        self.tick()
+
+        # Particles (batched update, dead ones are compacted away); the ones
+        # still alive when the farm screen is left would never be drawn
+        if self.state != GameState.MAIN:
+            self.particles.clear()
+        self.particles.update()
+        if not len(self.particles):
+            self.renderer.stop_animation('particles')
+
+    def check_manual_save(self):
+        """Play the Save button's feedback once its background write finished"""
+        if self.manual_save is None:
+            return
+        request, (x, y) = self.manual_save
+        saved = self.autosave.result(request)
+        if saved is None:
+            return
+        self.manual_save = None
+        self.renderer.stop_animation('save')
+        if saved:
+            print("Game saved successfully!")
+            self.create_particles(x, y, "coin")
 
-        # Update plots
-        for plot in self.plots:
-            plot.update()
+    def toggle_profiler(self):
+        """Start or stop frame profiling and its overlay"""
+        if self.profiler.toggle(self, PROFILED_DRAWS):
+            self.renderer.start_animation('profiler')
+        else:
+            self.renderer.stop_animation('profiler')
 
-        # Day cycle (optional)
-        if self.animation_timer % 3600 == 0:  # New day every minute
-            self.day += 1
-            self.weather = random.choice(list(Weather))
+    def export_profile(self):
+        """Write the profiled frames as a CSV table and a JSON trace"""
+        try:
+            for path in PROFILE_TRACE_FILES:
+                self.profiler.export(path)
+            print(f"Profile saved to {', '.join(PROFILE_TRACE_FILES)}")
+        except OSError as e:
+            print(f"Error saving profile: {e}")
+
+    def wait_for_input(self):
+        """Sleep until an event arrives or IDLE_TIMEOUT passes, catching the
+        simulation up on the time slept; returns the events that woke us"""
+        start = time.perf_counter()
+        event = pygame.event.wait(IDLE_TIMEOUT)
+        self.advance(self.sim_clock.skip(time.perf_counter() - start))
+        self.clock.tick()  # the sleep does not count as frame time
+        self.frame_time = 0.0
+        return () if event.type == pygame.NOEVENT else (event,)
 
     def run(self):
         """Main game loop"""
+        profiler = self.profiler
+        woken_by = ()
         while self.running:
-            self.handle_events()
-            self.update()
-
-            # Draw based on current state
-            if self.state == GameState.START_SCREEN:
-                self.draw_start_screen()
-            elif self.state == GameState.MAIN:
-                self.draw_main_game()
-            elif self.state == GameState.SHOP:
-                self.draw_shop()
-            elif self.state == GameState.INVENTORY:
-                self.draw_inventory()
-            elif self.state == GameState.PLANTING:
-                self.draw_planting_menu()
-            elif self.state == GameState.SETTINGS:
-                self.draw_settings()
-
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            profiler.begin_frame()
+            with profiler.scope('events'):
+                self.handle_events(woken_by)
+            if not self.running:
+                break  # quit: the autosave worker is closed, skip the frame and the idle wait
+
+            # Fixed-timestep simulation: catch up on the real time that passed
+            with profiler.scope('update'):
+                ticks = self.sim_clock.advance(self.frame_time)
+                for _ in range(ticks):
+                    self.update()
+            if ticks and self.state == GameState.MAIN:
+                # The farm and the panel show the simulation
+                self.renderer.mark_full()
+            with profiler.scope('animate'):
+                self.animate()
+            if self.state != GameState.START_SCREEN:
+                with profiler.scope('autosave'):
+                    self.autosave.update()
+            self.check_manual_save()
+            if profiler.enabled:
+                self.renderer.mark_full()  # the overlay changes every frame
+
+            # Draw based on current state (skipped if nothing changed)
+            if self.renderer.needs_redraw():
+                with profiler.scope('draw'):
+                    self.renderer.begin_frame(self.screen)
+                    self.draw_screen()
+                if profiler.enabled:
+                    profiler.draw_overlay(self.screen, self.clock.get_fps())
+
+            with profiler.scope('present'):
+                self.renderer.present(self.screen)
+            profiler.end_frame()
+
+            # Nothing marked or animating: block until input instead of spinning
+            if self.renderer.idle():
+                woken_by = self.wait_for_input()
+            else:
+                woken_by = ()
+                self.frame_time = self.clock.tick(self.target_fps()) / 1000
 
         pygame.quit()
         sys.exit()
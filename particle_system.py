@@ -0,0 +1,164 @@
+import numpy as np
+import pygame
+
+
+GRAVITY = 0.2
+COLORKEY = (255, 0, 255)  # transparent background of the particle sprites
+MAX_RADIUS = 16  # off-screen culling margin
+LOAD_SHED_START = 0.5  # pool fill ratio above which bursts get thinned
+
+
+class ParticleSystem:
+    """Array-backed particle pool.
+
+    Position, velocity, life and style (color + size) live in pre-allocated
+    NumPy columns of fixed capacity: live particles occupy [0, count), dead
+    ones are swap-removed so their slots are recycled, and emitting never
+    allocates particle objects. Effects are data-driven emitter presets.
+
+    Once the pool is more than LOAD_SHED_START full, bursts are thinned in
+    proportion to the remaining headroom, and anything that does not fit is
+    dropped, so rapid clicking cannot blow past the budget.
+    """
+
+    def __init__(self, capacity=10000, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.style = np.zeros(capacity, dtype=np.uint16)
+        self._random = np.zeros(capacity, dtype=np.float32)
+        self.rng = np.random.default_rng(seed)
+
+        # Style id -> sprite and radius (arrays, so draw() looks them up in
+        # bulk); (color, size) -> style id
+        self._sprites = np.empty(0, dtype=object)
+        self._radii = np.empty(0, dtype=np.int32)
+        self._styles = {}
+        self.presets = {}
+
+        # Stats
+        self.emitted = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.count
+
+    def get_style(self, color, size):
+        """Return the style id for a circle of this color and radius"""
+        style = self._styles.get((color, size))
+        if style is None:
+            # Colorkeyed + RLE sprites blit much faster than per-pixel alpha
+            sprite = pygame.Surface((size * 2, size * 2))
+            sprite.fill(COLORKEY)
+            pygame.draw.circle(sprite, color, (size, size), size)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprite.set_colorkey(COLORKEY, pygame.RLEACCEL)
+            style = len(self._sprites)
+            sprites = np.empty(style + 1, dtype=object)
+            sprites[:style] = self._sprites
+            sprites[style] = sprite
+            self._sprites = sprites
+            self._radii = np.append(self._radii, np.int32(size))
+            self._styles[(color, size)] = style
+        return style
+
+    def load_presets(self, table):
+        """Register emitter presets from a {name: preset dict} table"""
+        for name, preset in table.items():
+            self.add_preset(name, **preset)
+
+    def add_preset(self, name, count, vx, vy, colors, life, size):
+        """Register one emitter preset (velocity ranges are (min, max))"""
+        self.presets[name] = {
+            'count': count,
+            'vx': vx,
+            'vy': vy,
+            'styles': np.array([self.get_style(color, size) for color in colors], dtype=np.uint16),
+            'life': life
+        }
+
+    def emit_preset(self, name, x, y, scale=1):
+        """Fire a preset at (x, y); scale multiplies its particle count"""
+        preset = self.presets.get(name)
+        if preset is None:
+            return 0
+        return self.emit(x, y, preset['count'] * scale, preset['vx'], preset['vy'],
+                         preset['styles'], preset['life'])
+
+    def emit(self, x, y, count, vx_range, vy_range, styles, life):
+        """Spawn up to `count` particles into free pool slots.
+
+        Returns how many were actually spawned after load shedding.
+        """
+        requested = count
+        free = self.capacity - self.count
+        shed_start = int(self.capacity * LOAD_SHED_START)
+        if self.count > shed_start:
+            count = max(1, count * free // (self.capacity - shed_start))
+        count = min(count, free)
+        self.dropped += requested - count
+        if count <= 0:
+            return 0
+
+        start, end = self.count, self.count + count
+        random = self._random[:count]
+        self.pos[start:end] = (x, y)
+        for axis, (low, high) in enumerate((vx_range, vy_range)):
+            self.rng.random(out=random, dtype=np.float32)
+            self.vel[start:end, axis] = low + (high - low) * random
+        self.life[start:end] = life
+        if len(styles) == 1:
+            self.style[start:end] = styles[0]
+        else:
+            self.style[start:end] = styles[self.rng.integers(len(styles), size=count)]
+
+        self.count = end
+        self.emitted += count
+        return count
+
+    def update(self):
+        """Advance all live particles one frame and drop the dead ones"""
+        n = self.count
+        if not n:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.vel[:n, 1] += GRAVITY
+        self.life[:n] -= 1
+        self._compact()
+
+    def draw(self, screen):
+        """Blit every live particle in one batched call"""
+        n = self.count
+        if not n:
+            return
+        width, height = screen.get_size()
+        pos = self.pos[:n].astype(np.int32)
+        visible = ((pos[:, 0] > -MAX_RADIUS) & (pos[:, 0] < width + MAX_RADIUS) &
+                   (pos[:, 1] > -MAX_RADIUS) & (pos[:, 1] < height + MAX_RADIUS))
+        style = self.style[:n][visible]
+        # Sprites and top-left corners come from array lookups, not a Python
+        # loop per particle; what is left is the blits() call itself
+        corners = pos[visible] - self._radii[style][:, None]
+        screen.blits(zip(self._sprites[style].tolist(), corners.tolist()), doreturn=False)
+
+    def clear(self):
+        """Remove all particles"""
+        self.count = 0
+
+    def _compact(self):
+        """Swap-remove dead particles: fill holes with live ones from the tail"""
+        n = self.count
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if not len(dead):
+            return
+        new_count = n - len(dead)
+        holes = dead[dead < new_count]
+        if len(holes):
+            tail = np.arange(new_count, n)
+            movers = tail[self.life[new_count:n] > 0]
+            for column in (self.pos, self.vel, self.life, self.style):
+                column[holes] = column[movers]
+        self.count = new_count
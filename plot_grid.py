@@ -0,0 +1,99 @@
+import pygame
+import numpy as np
+from farm_store import FarmStore, PlotView
+
+
+class PlotGrid:
+    """Spatial index over a regular grid of farm plots.
+
+    Tiles live row-major in a FarmStore; the grid is a sequence of
+    PlotViews created on demand, so a position maps to its plot in O(1)
+    with two integer divisions. Points in the gaps between tiles map to
+    no plot.
+    """
+
+    def __init__(self, rows, cols, origin, spacing, tile_size):
+        self.rows = rows
+        self.cols = cols
+        self.origin_x, self.origin_y = origin
+        self.spacing = spacing
+        self.tile_size = tile_size
+        self.store = FarmStore(rows * cols)
+
+    def __len__(self):
+        return self.store.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.store.size
+        if not 0 <= index < self.store.size:
+            raise IndexError("plot index out of range")
+        row, col = divmod(index, self.cols)
+        rect = pygame.Rect(self.origin_x + col * self.spacing, self.origin_y + row * self.spacing,
+                           self.tile_size, self.tile_size)
+        return PlotView(self.store, index, rect)
+
+    def __iter__(self):
+        self.store.sync()
+        for index in range(self.store.size):
+            yield self[index]
+
+    def bounds(self):
+        """(left, top, width, height) covered by all tiles"""
+        return (self.origin_x, self.origin_y,
+                (self.cols - 1) * self.spacing + self.tile_size,
+                (self.rows - 1) * self.spacing + self.tile_size)
+
+    def get(self, row, col):
+        """Plot at grid cell (row, col), or None if outside the grid"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self[row * self.cols + col]
+        return None
+
+    def cell_at(self, pos):
+        """(row, col) of the tile under pos, or None for gaps/outside"""
+        dx = pos[0] - self.origin_x
+        dy = pos[1] - self.origin_y
+        col, offset_x = divmod(dx, self.spacing)
+        row, offset_y = divmod(dy, self.spacing)
+        if offset_x >= self.tile_size or offset_y >= self.tile_size:
+            return None
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return int(row), int(col)
+        return None
+
+    def plot_at(self, pos):
+        """Plot under pos, or None"""
+        cell = self.cell_at(pos)
+        if cell is None:
+            return None
+        return self[cell[0] * self.cols + cell[1]]
+
+    def cell_range(self, rect):
+        """Row and column ranges of the cells whose tiles touch rect"""
+        left, top, width, height = rect
+        first_col = max(0, (left - self.origin_x - self.tile_size) // self.spacing + 1)
+        first_row = max(0, (top - self.origin_y - self.tile_size) // self.spacing + 1)
+        last_col = min(self.cols - 1, (left + width - 1 - self.origin_x) // self.spacing)
+        last_row = min(self.rows - 1, (top + height - 1 - self.origin_y) // self.spacing)
+        return range(int(first_row), int(last_row) + 1), range(int(first_col), int(last_col) + 1)
+
+    def indices_in_rect(self, rect):
+        """Store indices (row-major array) of the tiles that intersect rect"""
+        rows, cols = self.cell_range(rect)
+        return (np.arange(rows.start, rows.stop)[:, None] * self.cols +
+                np.arange(cols.start, cols.stop)).ravel()
+
+    def plots_in_rect(self, rect):
+        """All plots whose tiles intersect rect (e.g. the camera view)"""
+        indices = self.indices_in_rect(rect)
+        if len(indices):
+            self.store.sync(indices)
+        return [self[index] for index in indices.tolist()]
+
+    def bounding_rect(self, indices):
+        """Smallest rect covering the tiles at indices (non-empty)"""
+        rows, cols = np.divmod(indices, self.cols)
+        first = self.get(int(rows.min()), int(cols.min())).rect
+        last = self.get(int(rows.max()), int(cols.max())).rect
+        return first.union(last)
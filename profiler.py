@@ -0,0 +1,269 @@
+"""Frame profiler: scoped timers, rolling frame-time percentiles, draw-call
+and blit counters, an in-game overlay and CSV / JSON trace export.
+
+While disabled, scope() hands back a shared no-op context manager and
+nothing is wrapped or patched, so the instrumented game loop costs a few
+attribute lookups per frame. enable() wraps the named draw methods of the
+target with timers, swaps its screen for a blit-counting stand-in and
+patches the pygame.draw functions to count calls; disable() undoes all of
+it.
+
+Exported traces:
+
+    .csv   one row per frame: total and per-section milliseconds, draws, blits
+    .json  Chrome trace events (open in chrome://tracing or ui.perfetto.dev)
+"""
+import contextlib
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+from text_cache import TextCache
+
+
+FRAME_WINDOW = 600  # frames kept for percentiles and export (10 s at 60 FPS)
+DRAW_FUNCTIONS = ('rect', 'circle', 'ellipse', 'line', 'lines', 'aaline', 'aalines', 'polygon', 'arc')
+OVERLAY_SECTIONS = 12  # slowest sections listed on the overlay
+OVERLAY_REFRESH = 30  # frames between overlay updates (stats over the window are not free)
+OVERLAY_BACKGROUND = (0, 0, 0, 180)
+OVERLAY_TEXT = (255, 255, 255)
+OVERLAY_TEXT_CACHE = 64  # own cache, so overlay numbers never evict the game's labels
+
+_NO_SCOPE = contextlib.nullcontext()
+
+
+class CountingSurface:
+    """Display surface stand-in that counts blits while profiling"""
+
+    def __init__(self, surface, profiler):
+        self.surface = surface
+        self.profiler = profiler
+
+    def blit(self, *args, **kwargs):
+        self.profiler.blits += 1
+        return self.surface.blit(*args, **kwargs)
+
+    def blits(self, blit_sequence, *args, **kwargs):
+        blit_sequence = list(blit_sequence)
+        self.profiler.blits += len(blit_sequence)
+        return self.surface.blits(blit_sequence, *args, **kwargs)
+
+    def fill(self, *args, **kwargs):
+        self.profiler.draws += 1
+        return self.surface.fill(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.surface, name)
+
+
+def _unwrap(surface):
+    return surface.surface if isinstance(surface, CountingSurface) else surface
+
+
+class FrameProfiler:
+    """Per-frame timings of named sections over a rolling window of frames.
+
+    Call begin_frame()/end_frame() around each frame's work and wrap its
+    phases in `with profiler.scope(name):`. Sections may nest; each one
+    records the inclusive time of every call within the frame.
+    """
+
+    def __init__(self, window=FRAME_WINDOW):
+        self.enabled = False
+        self.frames = deque(maxlen=window)  # (total ms, {section: ms}, draws, blits)
+        self.trace = deque(maxlen=window)  # per frame: [(section, start s, duration s)]
+        self.draws = 0
+        self.blits = 0
+        self._frame_start = 0.0
+        self._sections = {}
+        self._events = []
+        self._target = None
+        self._screen = None
+        self._wrapped = []
+        self._draw_functions = {}
+        self._font = None
+        self._text_cache = TextCache(OVERLAY_TEXT_CACHE)
+        self._overlay = None
+        self._overlay_age = 0
+
+    def enable(self, target, methods=()):
+        """Start profiling `target` (an object with a `screen` surface), timing
+        each of its `methods` as a section of its own"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._target = target
+        self._screen = target.screen
+        target.screen = CountingSurface(target.screen, self)
+        for name in methods:
+            setattr(target, name, self._timed_method(name, getattr(target, name)))
+            self._wrapped.append(name)
+        for name in DRAW_FUNCTIONS:
+            function = getattr(pygame.draw, name, None)
+            if function is not None:
+                self._draw_functions[name] = function
+                setattr(pygame.draw, name, self._counted_draw(function))
+        self.begin_frame()
+
+    def disable(self):
+        """Stop profiling and restore everything enable() changed (collected frames are kept)"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        for name, function in self._draw_functions.items():
+            setattr(pygame.draw, name, function)
+        self._draw_functions.clear()
+        for name in self._wrapped:
+            delattr(self._target, name)
+        self._wrapped.clear()
+        self._target.screen = self._screen
+        self._target = self._screen = None
+        self._overlay = None
+
+    def toggle(self, target, methods=()):
+        """Enable or disable profiling of target; returns the new state"""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable(target, methods)
+        return self.enabled
+
+    def scope(self, name):
+        """Context manager timing one section of the current frame"""
+        if not self.enabled:
+            return _NO_SCOPE
+        return self._scope(name)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._sections = {}
+        self._events = []
+        self.draws = 0
+        self.blits = 0
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        total = (time.perf_counter() - self._frame_start) * 1000
+        self.frames.append((total, self._sections, self.draws, self.blits))
+        self.trace.append(self._events)
+        self._overlay_age += 1
+
+    def percentiles(self, section=None, q=(50, 95, 99)):
+        """Frame time (or one section's time) percentiles in ms over the window"""
+        if section is None:
+            times = [frame[0] for frame in self.frames]
+        else:
+            times = [frame[1].get(section, 0.0) for frame in self.frames]
+        if not times:
+            return [0.0] * len(q)
+        return np.percentile(times, q).tolist()
+
+    def section_names(self):
+        """Every section seen in the window, in first-seen order"""
+        names = {}
+        for frame in self.frames:
+            names.update(dict.fromkeys(frame[1]))
+        return list(names)
+
+    def summary(self):
+        """{section: (mean ms, p95 ms)} over the window, slowest first"""
+        stats = {}
+        for name in self.section_names():
+            times = np.array([frame[1].get(name, 0.0) for frame in self.frames])
+            stats[name] = (float(times.mean()), float(np.percentile(times, 95)))
+        return dict(sorted(stats.items(), key=lambda item: -item[1][0]))
+
+    def draw_overlay(self, screen, fps):
+        """Draw the stats of the collected frames in the bottom-right corner"""
+        if not self.frames:
+            return
+        if self._overlay is None or self._overlay_age >= OVERLAY_REFRESH:
+            self._overlay = self._render_overlay(fps)
+            self._overlay_age = 0
+        screen = _unwrap(screen)
+        screen_width, screen_height = screen.get_size()
+        width, height = self._overlay.get_size()
+        screen.blit(self._overlay, (screen_width - width - 10, screen_height - height - 10))
+
+    def _render_overlay(self, fps):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 22)
+        p50, p95, p99 = self.percentiles()
+        _, _, draws, blits = self.frames[-1]
+        lines = [
+            f"FPS {fps:5.1f}   frame p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f} ms",
+            f"draw calls {draws}   blits {blits}   frames {len(self.frames)}",
+            f"{'section':<24}{'mean':>8}{'p95':>8}"
+        ]
+        for name, (mean, p95) in list(self.summary().items())[:OVERLAY_SECTIONS]:
+            lines.append(f"{name:<24}{mean:>8.3f}{p95:>8.3f}")
+
+        surfaces = [self._text_cache.render(self._font, line, True, OVERLAY_TEXT) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 20
+        height = sum(surface.get_height() + 2 for surface in surfaces) + 16
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(OVERLAY_BACKGROUND)
+        y = 8
+        for surface in surfaces:
+            panel.blit(surface, (10, y))
+            y += surface.get_height() + 2
+        return panel
+
+    def export(self, path):
+        """Write the collected frames to path: Chrome trace JSON for .json, else CSV"""
+        if path.endswith(".json"):
+            events = []
+            origin = self.trace[0][0][1] if self.trace and self.trace[0] else 0.0
+            for frame, frame_events in enumerate(self.trace):
+                for name, start, duration in frame_events:
+                    events.append({
+                        'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                        'ts': round((start - origin) * 1e6, 1),
+                        'dur': round(duration * 1e6, 1),
+                        'args': {'frame': frame}
+                    })
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        else:
+            names = self.section_names()
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame', 'total_ms', 'draws', 'blits'] + names)
+                for frame, (total, sections, draws, blits) in enumerate(self.frames):
+                    writer.writerow([frame, f"{total:.4f}", draws, blits] +
+                                    [f"{sections.get(name, 0.0):.4f}" for name in names])
+        return path
+
+    @contextlib.contextmanager
+    def _scope(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, start, time.perf_counter())
+
+    def _record(self, name, start, end):
+        self._sections[name] = self._sections.get(name, 0.0) + (end - start) * 1000
+        self._events.append((name, start, end - start))
+
+    def _timed_method(self, name, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._record(name, start, time.perf_counter())
+        return timed
+
+    def _counted_draw(self, function):
+        def counted(surface, *args, **kwargs):
+            self.draws += 1
+            return function(_unwrap(surface), *args, **kwargs)
+        return counted
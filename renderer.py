@@ -0,0 +1,101 @@
+import time
+import pygame
+
+
+class DirtyRectRenderer:
+    """Presents frames to the display, only when something changed.
+
+    Input and simulation changes invalidate the screen with mark() or
+    mark_full(); frames with nothing marked are skipped. With dirty rects
+    disabled any mark is a full redraw + flip. When enabled, draw code
+    reports the rectangles it touches and only those regions are pushed
+    with pygame.display.update(rects).
+
+    Animations register with start_animation() and keep frames coming
+    until they finish; when none is running and nothing is marked the
+    renderer is idle() and the game loop can sleep until the next event.
+    """
+
+    def __init__(self, screen_size, enabled=False):
+        self.screen_rect = pygame.Rect((0, 0), screen_size)
+        self.enabled = enabled
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.animations = {}  # name -> end time (monotonic), None = until stopped
+
+        # Stats
+        self.last_presented_pixels = 0
+        self.total_presented_pixels = 0
+        self.frames_presented = 0
+        self.frames_skipped = 0
+
+    def mark(self, rect):
+        """Report a screen region that changed this frame"""
+        if not self.enabled:
+            self.full_redraw = True
+            return
+        if self.full_redraw:
+            return
+        rect = self.screen_rect.clip(rect)
+        if rect.width and rect.height:
+            self.dirty_rects.append(rect)
+
+    def mark_full(self):
+        """Request a full-screen redraw (state change, input, ...)"""
+        self.full_redraw = True
+        self.dirty_rects.clear()
+
+    def needs_redraw(self):
+        """True if anything was marked since the last present"""
+        return self.full_redraw or bool(self.dirty_rects)
+
+    def start_animation(self, name, duration=None):
+        """Keep frames coming for `duration` seconds, or until stop_animation(name)"""
+        self.animations[name] = None if duration is None else time.monotonic() + duration
+
+    def stop_animation(self, name):
+        """Mark an animation as finished"""
+        self.animations.pop(name, None)
+
+    def animating(self):
+        """True while any animation is running (finished ones are dropped)"""
+        now = time.monotonic()
+        for name, end in list(self.animations.items()):
+            if end is not None and end <= now:
+                del self.animations[name]
+        return bool(self.animations)
+
+    def idle(self):
+        """True if nothing is marked or animating, so no frame is needed until input"""
+        return not self.needs_redraw() and not self.animating()
+
+    def begin_frame(self, screen):
+        """Restrict drawing to the marked regions"""
+        if self.enabled and not self.full_redraw:
+            screen.set_clip(self.dirty_rects[0].unionall(self.dirty_rects[1:]))
+
+    def present(self, screen):
+        """Push the frame to the display and reset the dirty state"""
+        if not self.needs_redraw():
+            self.frames_skipped += 1
+            self.last_presented_pixels = 0
+            return
+
+        if not self.enabled or self.full_redraw:
+            pygame.display.flip()
+            pixels = self.screen_rect.width * self.screen_rect.height
+        else:
+            screen.set_clip(None)
+            pygame.display.update(self.dirty_rects)
+            pixels = sum(rect.width * rect.height for rect in self.dirty_rects)
+
+        self.last_presented_pixels = pixels
+        self.total_presented_pixels += pixels
+        self.frames_presented += 1
+        self.full_redraw = False
+        self.dirty_rects.clear()
+
+    def average_presented_pixels(self):
+        """Mean pixels pushed per frame, counting skipped frames as zero"""
+        frames = self.frames_presented + self.frames_skipped
+        return self.total_presented_pixels / frames if frames else 0
@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+
+
+JOURNAL_SUFFIX = ".journal"
+COMPACT_EVERY = 32  # journal entries before they are folded into a new snapshot
+
+
+def write_atomic(path, content):
+    """Replace path with text or bytes so readers only ever see the old or the new file"""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb' if isinstance(content, bytes) else 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    sync_directory(path)
+
+
+def sync_directory(path):
+    """fsync the directory holding path, so a rename or removal in it is durable"""
+    if os.name != 'posix':
+        return  # directories cannot be opened (or need no sync) elsewhere
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def new_generation():
+    """Random snapshot generation, unrelated to any earlier one"""
+    return int.from_bytes(os.urandom(6), 'big')
+
+
+def migrate_inventory(saved_inventory):
+    """Inventory in the categorized format, converting the old flat one if needed"""
+    if 'crops' in saved_inventory:
+        return saved_inventory
+    # Old format - convert to new
+    return {
+        "crops": {
+            "durian": saved_inventory.get("durian", 0),
+            "mangosteen": saved_inventory.get("mangosteen", 0)
+        },
+        "seeds": {
+            "durian_seeds": saved_inventory.get("durian_seeds", 10),
+            "mangosteen_seeds": saved_inventory.get("mangosteen_seeds", 10)
+        },
+        "tools": {
+            "fertilizer": saved_inventory.get("fertilizer", 10),
+            "water_can": saved_inventory.get("water_can", 10)
+        }
+    }
+
+
+def save_age(header):
+    """Sort key of a save header: a later timestamp, then a later tick, is newer"""
+    return header.get('timestamp') or "", header.get('tick', 0)
+
+
+class SaveSnapshot:
+    """Everything one save writes, copied on the main thread so it can be
+    serialized later (e.g. on the autosave thread) while the game goes on.
+
+    kind is "journal" (only the plots at `indices`), "snapshot" (every
+    plot, JSON) or "binary" (every plot, binary format); `plots` is a
+    PLOT_RECORD table of those plots and `slot` the save slot to write.
+    """
+
+    __slots__ = ('slot', 'kind', 'header', 'indices', 'plots', 'crop_names')
+
+    def __init__(self, slot, kind, header, indices, plots, crop_names):
+        self.slot = slot
+        self.kind = kind
+        self.header = header
+        self.indices = indices
+        self.plots = plots
+        self.crop_names = crop_names
+
+
+class SaveFile:
+    """Crash-safe save made of a full snapshot plus an append-only journal.
+
+    The snapshot is rewritten atomically (temp file + rename). Between
+    snapshots each save appends one journal line holding the header
+    (coins, inventory, tick, ...) and only the plots that changed. Journal
+    lines carry the snapshot's generation, a random token drawn for each
+    new snapshot, so a journal left behind by a crash during compaction is
+    ignored (even by a process that never loaded the old snapshot), and a
+    torn last line ends the replay and forces the next save to compact.
+
+    Plot records are valid as of the tick of the entry they were written
+    in; load() reports that tick per plot so the caller can catch each
+    plot up from there.
+
+    The bookkeeping (generation, entry and byte counts) is shared between
+    the thread that captures saves and the one that writes them, so it is
+    only touched under the instance lock. Writes do their file I/O outside
+    the lock, so the capturing thread never waits on a disk write.
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.generation = 0
+        self.entries = 0
+        self.snapshot_bytes = 0
+        self.journal_bytes = 0
+        self.needs_snapshot = True
+        self._lock = threading.RLock()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def remove(self):
+        """Delete the snapshot and journal (e.g. once the slot is saved in another format)"""
+        with self._lock:
+            for path in (self.path, self.journal_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.needs_snapshot = True
+
+    def request_snapshot(self):
+        """Make the next save a full snapshot (e.g. after a reset)"""
+        with self._lock:
+            self.needs_snapshot = True
+
+    def should_compact(self):
+        """True if the next save must (or should) be a full snapshot"""
+        with self._lock:
+            return (self.needs_snapshot or self.entries >= self.compact_every
+                    or self.journal_bytes > self.snapshot_bytes)
+
+    def load(self):
+        """Read the snapshot and replay the journal over it.
+
+        Returns the merged save data (None if there is no save); its
+        'plot_ticks' list holds the tick each plot record is valid at.
+        """
+        with self._lock:
+            if not self.exists():
+                return None
+            with open(self.path, 'r') as f:
+                text = f.read()
+            data = json.loads(text)
+            self.generation = data.get('generation', 0)
+            self.snapshot_bytes = len(text)
+            self.entries = 0
+            self.journal_bytes = 0
+            self.needs_snapshot = False
+
+            plots = data.setdefault('plots', [])
+            plot_ticks = [data.get('tick', 0)] * len(plots)
+            for entry in self._read_journal():
+                for key, record in entry.pop('plots').items():
+                    index = int(key)
+                    if index < len(plots):
+                        plots[index] = record
+                        plot_ticks[index] = entry.get('tick', 0)
+                data.update(entry)
+            data['plot_ticks'] = plot_ticks
+            return data
+
+    def write_snapshot(self, data):
+        """Atomically replace the save with a full snapshot and drop the journal.
+
+        Returns the bytes written.
+        """
+        with self._lock:
+            self.generation = generation = new_generation()
+        text = json.dumps(dict(data, generation=generation), separators=(',', ':'))
+        write_atomic(self.path, text)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        with self._lock:
+            self.snapshot_bytes = len(text)
+            self.entries = 0
+            self.journal_bytes = 0
+            self.needs_snapshot = False
+        return len(text)
+
+    def append(self, header, plots):
+        """Append one journal entry: header fields plus {index: plot record}.
+
+        Returns the bytes written.
+        """
+        with self._lock:
+            generation = self.generation
+        entry = dict(header, generation=generation,
+                     plots={str(index): record for index, record in plots.items()})
+        line = json.dumps(entry, separators=(',', ':')) + "\n"
+        with open(self.journal_path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        with self._lock:
+            self.entries += 1
+            self.journal_bytes += len(line)
+        return len(line)
+
+    def _read_journal(self):
+        """Valid journal entries of the current generation, in order"""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r') as f:
+            for line in f:
+                try:
+                    if not line.endswith("\n"):
+                        raise ValueError("torn journal entry")
+                    entry = json.loads(line)
+                except ValueError:
+                    # Crash mid-append: keep what came before, compact on next save
+                    self.needs_snapshot = True
+                    return
+                if entry.get('generation', 0) != self.generation:
+                    continue
+                self.entries += 1
+                self.journal_bytes += len(line)
+                yield entry
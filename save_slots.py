@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+
+from binary_save import BinarySave
+from save_file import SaveFile, save_age, write_atomic
+
+
+SLOT_COUNT = 3
+INDEX_FILE = "saves_index.json"
+
+
+def slot_paths(slot):
+    """(JSON save path, binary save path) of a slot; slot 1 keeps the original names"""
+    base = "farm_save" if slot == 1 else f"farm_save_{slot}"
+    return base + ".json", base + ".bin"
+
+
+def latest_save(save_file, binary_path, prefer_binary=False):
+    """The newest save of a slot: ("binary", BinarySave), ("json", data) or (None, None).
+
+    A slot can hold both formats, e.g. after binary saves were switched
+    on or off in the settings. The header with the later timestamp (then
+    tick) wins; ties go to the preferred format. The caller closes a
+    returned BinarySave.
+    """
+    save = BinarySave.read(binary_path) if os.path.exists(binary_path) else None
+    try:
+        data = save_file.load()
+    except Exception:
+        if save is not None:
+            save.close()
+        raise
+    if save is None:
+        return ("json", data) if data is not None else (None, None)
+    if data is not None:
+        binary_age, json_age = save_age(save.header()), save_age(data)
+        if json_age > binary_age or (json_age == binary_age and not prefer_binary):
+            save.close()
+            return "json", data
+    return "binary", save
+
+
+class SaveSlots:
+    """Save slots plus a small index file of per-slot metadata.
+
+    The index (day, level, coins, timestamp and size on disk per slot, and
+    the last slot played) is read once and kept in memory, so menus can
+    show every slot without touching the save files; a slot's save body is
+    only read when the game loads it. record() is called after each write,
+    possibly from the autosave thread, and rewrites the index atomically.
+    A missing or unreadable index is rebuilt from the save files, and a
+    slot whose files were deleted behind its back is dropped from it.
+    """
+
+    def __init__(self, index_path=INDEX_FILE, slot_count=SLOT_COUNT):
+        self.index_path = index_path
+        self.slot_count = slot_count
+        self.last_slot = 1
+        self.slots = {}  # slot -> metadata dict
+        self._save_files = {}
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def has(self, slot):
+        """True if the slot holds a save (from the cached index, no file access)"""
+        return slot in self.slots
+
+    def verify(self, slot):
+        """True if the slot's save is still on disk; forgets the slot if it is not"""
+        if slot not in self.slots:
+            return False
+        if self._missing(slot):
+            del self.slots[slot]
+            self._write_index()
+            # A journal entry would have no snapshot to apply to
+            self.save_file(slot).request_snapshot()
+            return False
+        return True
+
+    def info(self, slot):
+        """Cached metadata of a slot, or None if it is empty"""
+        return self.slots.get(slot)
+
+    def save_file(self, slot):
+        """The SaveFile (JSON snapshot + journal) of a slot"""
+        save_file = self._save_files.get(slot)
+        if save_file is None:
+            save_file = SaveFile(slot_paths(slot)[0])
+            self._save_files[slot] = save_file
+        return save_file
+
+    def select(self, slot):
+        """Remember `slot` as the one to offer first next time"""
+        if slot != self.last_slot:
+            self.last_slot = slot
+            self._write_index()
+
+    def record(self, slot, header):
+        """Update a slot's metadata after a save was written"""
+        self.slots[slot] = self._metadata(slot, header)
+        self.last_slot = slot
+        self._write_index()
+
+    def _metadata(self, slot, header):
+        size = sum(os.path.getsize(path) for path in self._files(slot) if os.path.exists(path))
+        return {
+            'day': header.get('day', 1),
+            'level': header.get('level', 1),
+            'coins': header.get('coins', 0),
+            'timestamp': header.get('timestamp'),
+            'size': size
+        }
+
+    def _missing(self, slot):
+        """True if neither save format of the slot is on disk"""
+        return not any(os.path.exists(path) for path in slot_paths(slot))
+
+    def _files(self, slot):
+        json_path, binary_path = slot_paths(slot)
+        return json_path, self.save_file(slot).journal_path, binary_path
+
+    def _write_index(self):
+        with self._lock:
+            index = {
+                'last_slot': self.last_slot,
+                'slots': {str(slot): info for slot, info in self.slots.items()}
+            }
+            write_atomic(self.index_path, json.dumps(index, indent=2))
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            self.last_slot = index.get('last_slot', 1)
+            self.slots = {int(slot): info for slot, info in index.get('slots', {}).items()
+                          if not self._missing(int(slot))}
+        except (OSError, ValueError):
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Scan the slot files once (first run, or the index was lost)"""
+        for slot in range(1, self.slot_count + 1):
+            json_path, binary_path = slot_paths(slot)
+            try:
+                kind, save = latest_save(SaveFile(json_path), binary_path)
+            except (OSError, ValueError) as e:
+                print(f"Error reading save slot {slot}: {e}")
+                continue
+            if kind is None:
+                continue
+            if kind == "binary":
+                header = save.header()
+                save.close()
+            else:
+                header = save
+            self.slots[slot] = self._metadata(slot, header)
+        if self.slots:
+            self.last_slot = max(self.slots, key=lambda slot: self.slots[slot]['timestamp'] or "")
+            self._write_index()
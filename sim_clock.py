@@ -0,0 +1,44 @@
+class FixedTimestep:
+    """Accumulator for a fixed-rate simulation driven by a variable frame rate.
+
+    Each frame, advance() is given the real time that passed and returns
+    how many fixed ticks to simulate; whatever is left over becomes
+    `alpha`, the fraction of the way to the next tick, for interpolating
+    animations. After long stalls at most `max_steps` ticks are run, so a
+    slow machine slows the game down instead of spiralling; time spent
+    sleeping on an idle screen is caught up in full with skip().
+    """
+
+    def __init__(self, rate, max_steps=10):
+        self.rate = rate
+        self.step = 1.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.ticks = 0
+
+    def advance(self, elapsed):
+        """Add `elapsed` seconds of real time; return the number of ticks due"""
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        self.ticks += steps
+        return steps
+
+    def skip(self, elapsed):
+        """Add `elapsed` seconds the game loop slept through waiting for input.
+
+        Returns every tick due, without the max_steps cap: the time was
+        idle, not a slow frame, so the caller can fast-forward in one step.
+        """
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        self.ticks += steps
+        return steps
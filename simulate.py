@@ -0,0 +1,92 @@
+"""Headless farm simulation for balancing crop economics.
+
+Runs FarmEngine with no window, audio or rendering, letting a scripted
+strategy play the farm at regular check-ins, e.g.:
+
+    python simulate.py --days 100000 --strategy mixed --seed 1
+"""
+import argparse
+import time
+
+from farm_engine import FarmEngine, SHOP_PRICES, TICKS_PER_DAY
+
+
+def farm(crops, fertilize=False):
+    """Strategy factory: harvest, till, keep seeds stocked, plant, water"""
+    def play(engine, stats):
+        for i, plot in enumerate(engine.plots):
+            harvested = engine.harvest_plot(plot)
+            if harvested:
+                name = harvested.type.name.lower()
+                stats['harvested'][name] = stats['harvested'].get(name, 0) + 1
+
+            engine.till_plot(plot)
+
+            if not plot.crop:
+                crop_name = crops[i % len(crops)]
+                seed_key = crop_name + "_seeds"
+                if engine.get_item_from_inventory(seed_key) == 0:
+                    if engine.buy_item(seed_key, SHOP_PRICES[seed_key]):
+                        stats['spent'] += SHOP_PRICES[seed_key]
+                engine.plant_plot(plot, crop_name)
+
+            if plot.crop and plot.moisture == 0:
+                engine.water_plot(plot)
+
+            if fertilize and plot.crop and not plot.crop.fertilized:
+                if engine.get_item_from_inventory("fertilizer") == 0:
+                    if engine.buy_item("fertilizer", SHOP_PRICES["fertilizer"]):
+                        stats['spent'] += SHOP_PRICES["fertilizer"]
+                engine.fertilize_plot(plot)
+    return play
+
+
+STRATEGIES = {
+    "durian": farm(["durian"]),
+    "mangosteen": farm(["mangosteen"]),
+    "mixed": farm(["durian", "mangosteen"]),
+    "durian-fertilized": farm(["durian"], fertilize=True),
+    "mangosteen-fertilized": farm(["mangosteen"], fertilize=True),
+    "mixed-fertilized": farm(["durian", "mangosteen"], fertilize=True),
+}
+
+
+def simulate(days, strategy, interval, rows, cols, seed):
+    """Play `days` days, calling the strategy every `interval` ticks"""
+    engine = FarmEngine(rows, cols, seed=seed)
+    play = STRATEGIES[strategy]
+    stats = {'harvested': {}, 'spent': 0}
+    end = days * TICKS_PER_DAY
+
+    start = time.perf_counter()
+    while engine.animation_timer < end:
+        play(engine, stats)
+        engine.advance(min(interval, end - engine.animation_timer))
+    elapsed = time.perf_counter() - start
+    return engine, stats, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="mixed")
+    parser.add_argument("--interval", type=int, default=TICKS_PER_DAY // 6,
+                        help="ticks between strategy check-ins (default: 6 per day)")
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--cols", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    engine, stats, elapsed = simulate(args.days, args.strategy, args.interval,
+                                      args.rows, args.cols, args.seed)
+    print(f"strategy: {args.strategy}  farm: {args.rows}x{args.cols}  days: {args.days}")
+    print(f"coins: {engine.coins}  level: {engine.level}  xp: {engine.xp}  day: {engine.day}")
+    for name, count in sorted(stats['harvested'].items()):
+        print(f"harvested {name}: {count} ({count / args.days:.2f}/day)")
+    print(f"spent in shop: {stats['spent']}")
+    print(f"net coins/day: {(engine.coins - 500) / args.days:.1f}")
+    print(f"simulated {args.days / elapsed:,.0f} days/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces.
+
+    Keyed by (font, text, antialias, color) so unchanged labels are only
+    rasterized once instead of every frame.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """Drop-in replacement for font.render(text, antialias, color)"""
+        key = (font, text, antialias, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces"""
+        self._surfaces.clear()
+
+    def hit_rate(self):
+        """Fraction of render calls served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._surfaces)